@@ -8,9 +8,13 @@
 
 from __future__ import annotations
 
+import heapq
 import os
 import re
+import shutil
 import subprocess
+from functools import lru_cache
+from html import unescape
 from typing import Optional
 
 from aqt import mw, gui_hooks  # type: ignore
@@ -30,22 +34,28 @@ SCRIPT_PATH = os.environ.get("ANKI_DECK_FIXER_SCRIPT", SCRIPT_PATH)
 # Optional: Python executable. By default, rely on 'python' in PATH.
 PYTHON_EXE = os.environ.get("ANKI_DECK_FIXER_PY", "python")
 
+# Resolve both once at load instead of on every hotkey press
+_RESOLVED_PY = shutil.which(PYTHON_EXE) or PYTHON_EXE
+_SCRIPT_OK = os.path.isfile(SCRIPT_PATH)
+
 # Default keyboard shortcut
 RUN_SHORTCUT = os.environ.get("ANKI_DECK_FIXER_SHORTCUT", "Ctrl+Alt+F")
 
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Handles filters like {{cloze:Text}} or {{text:Field}}
+_FRONT_FIELD_RE = re.compile(r"{{[^{}:|]+:(?P<f>[^{}|]+)}}|{{(?P<f2>[^{}:|]+)}}")
+
+
 def _strip_html(html: str) -> str:
     # Very simple HTML stripper; good enough for Anki question text
-    text = re.sub(r"<[^>]+>", " ", html or "")
+    text = _TAG_RE.sub(" ", html or "")
+    # unescape entities (&nbsp; becomes a non-breaking space, collapsed below)
+    text = unescape(text)
     # collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
-    # unescape a few entities
-    text = (text
-            .replace("&nbsp;", " ")
-            .replace("&amp;", "&")
-            .replace("&lt;", "<")
-            .replace("&gt;", ">"))
-    return text
+    return _WS_RE.sub(" ", text).strip()
 
 
 def _tokens_from_text(text: str, max_tokens: int = 3) -> list[str]:
@@ -53,25 +63,35 @@ def _tokens_from_text(text: str, max_tokens: int = 3) -> list[str]:
     - Keep Unicode word chars (incl. accents)
     - Prefer longer tokens, dedupe while preserving order
     """
-    # Split into word tokens
-    toks = re.findall(r"\w+", text, flags=re.UNICODE)
-    # Filter short tokens, keep order, dedupe
-    seen = set()
-    unique = []
-    for t in toks:
+    # Single scan: filter short tokens and dedupe case-insensitively, keeping
+    # the first spelling seen (dicts preserve insertion order)
+    unique: dict[str, str] = {}
+    for m in _WORD_RE.finditer(text):
+        t = m.group()
         if len(t) < 2:
             continue
-        if t.lower() in seen:
-            continue
-        seen.add(t.lower())
-        unique.append(t)
+        unique.setdefault(t.lower(), t)
     if not unique:
         return []
-    # Prefer longest tokens first, but keep relative order among equals
-    unique_sorted = sorted(unique, key=lambda s: (-len(s), unique.index(s)))
-    # Choose top-N and restore original order among the chosen
-    chosen = set(unique_sorted[:max_tokens])
-    return [t for t in unique if t in chosen]
+    # Prefer longest tokens, earlier ones first among equals
+    picks = heapq.nlargest(
+        max_tokens, enumerate(unique.values()), key=lambda p: (len(p[1]), -p[0])
+    )
+    # Restore original order among the chosen
+    picks.sort()
+    return [t for _, t in picks]
+
+
+@lru_cache(maxsize=32)
+def _field_name_for_template(qfmt: str, first_field: str) -> str:
+    """Return the first field referenced on a front template, or first_field"""
+    # Find first {{...}} reference on front
+    m = _FRONT_FIELD_RE.search(qfmt)
+    field_name = None
+    if m:
+        field_name = (m.group("f") or m.group("f2") or "").strip()
+    # fallback: first field
+    return field_name or first_field
 
 
 def _front_text_from_template(card) -> Optional[str]:
@@ -82,15 +102,7 @@ def _front_text_from_template(card) -> Optional[str]:
         note = card.note()
         model = note.model()
         qfmt = card.template().get("qfmt", "") if hasattr(card, "template") else ""
-        # Find first {{...}} reference on front
-        # Handles filters like {{cloze:Text}} or {{text:Field}}
-        m = re.search(r"{{[^{}:|]+:(?P<f>[^{}|]+)}}|{{(?P<f2>[^{}:|]+)}}", qfmt)
-        field_name = None
-        if m:
-            field_name = (m.group("f") or m.group("f2") or "").strip()
-        if not field_name:
-            # fallback: first field
-            field_name = model["flds"][0]["name"]
+        field_name = _field_name_for_template(qfmt, model["flds"][0]["name"])
         val = note.get(field_name)
         if isinstance(val, str):
             return _strip_html(val)
@@ -134,7 +146,11 @@ def _get_current_card_and_front_text() -> tuple[Optional[object], Optional[str],
 
 
 def _launch_fixer(deck_name: str, front_text: str) -> None:
-    if not os.path.isfile(SCRIPT_PATH):
+    global _SCRIPT_OK
+    # Re-check only while missing, in case it was created after Anki started
+    if not _SCRIPT_OK:
+        _SCRIPT_OK = os.path.isfile(SCRIPT_PATH)
+    if not _SCRIPT_OK:
         showWarning(f"Card Fixer script not found:\n{SCRIPT_PATH}\n\nSet ANKI_DECK_FIXER_SCRIPT env var or edit the add-on to adjust the path.")
         return
 
@@ -143,7 +159,7 @@ def _launch_fixer(deck_name: str, front_text: str) -> None:
     word_list = ",".join(toks) if toks else front_text[:100]
 
     args = [
-        PYTHON_EXE,
+        _RESOLVED_PY,
         SCRIPT_PATH,
         "--deck", deck_name,
         "--no-backup",
@@ -158,8 +174,24 @@ def _launch_fixer(deck_name: str, front_text: str) -> None:
     env = os.environ.copy()
 
     try:
-        # Use Popen so Anki UI remains responsive
-        subprocess.Popen(args, cwd=cwd, env=env)
+        # Use Popen so Anki UI remains responsive. Detach the child from Anki's
+        # stdin, file handles and session; stdout/stderr are kept (on Windows in
+        # a console of its own) so progress can still be followed.
+        if os.name == "nt":
+            popen_kwargs = {
+                "creationflags": subprocess.CREATE_NEW_CONSOLE
+                | subprocess.CREATE_NEW_PROCESS_GROUP
+            }
+        else:
+            popen_kwargs = {"start_new_session": True}
+        subprocess.Popen(
+            args,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            close_fds=True,
+            **popen_kwargs,
+        )
         showInfo("Launched Card Fixer for current card. You can follow progress in the external console.")
     except FileNotFoundError:
         # Likely 'python' not in PATH
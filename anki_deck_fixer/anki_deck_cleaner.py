@@ -11,19 +11,228 @@ This script cleans up an Anki deck according to specific formatting rules:
 
 Prerequisites:
 1. Install AnkiConnect add-on in Anki (code: 2055492159)
-2. Install required packages: pip install requests
+2. Install required packages: pip install requests (optional: orjson)
 3. Have Anki running with AnkiConnect enabled
 """
 
 import json
+import gzip
+import hashlib
+import os
+import threading
+import time
 import requests
 import re
 import html
-from typing import List, Dict, Tuple
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import zlib
+from typing import Iterator, List, Dict, Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import webbrowser
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 import traceback
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from http_helpers import CORS_HEADERS, send_response_with_body
+
+try:  # Optional C-accelerated JSON for the web API; the stdlib is used when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# clean_card takes ~0.1ms, so worker processes only pay off on scans larger than the web UI's 100-card chunks
+PARALLEL_CLEAN_MIN_CARDS = 512
+PARALLEL_CLEAN_CHUNK_SIZE = 128
+
+# Deck lists are fetched on every web request; they rarely change within seconds
+DECK_NAMES_MAX_AGE = 10.0
+# /api/status polls only need to know Anki answered recently
+STATUS_MAX_AGE = 1.0
+# Smaller JSON responses are sent as-is; gzip framing would outweigh the savings
+GZIP_MIN_BYTES = 1024
+
+# Two-digit uppercase hex for each color channel value
+_HEX_BYTES = tuple(f"{i:02X}" for i in range(256))
+
+# Styled gray lines kept per CardCleaner before the memo is dropped and refilled
+GRAY_LINE_CACHE_SIZE = 4096
+
+# Clean results kept per AnkiDeckCleaner, so rescanning cards that still need changes skips the cleaning
+CLEAN_RESULT_CACHE_SIZE = 4096
+
+# A prefetched cardsInfo batch older than this is fetched again, in case notes were edited meanwhile
+CARD_INFO_PREFETCH_MAX_AGE = 30.0
+
+# Note id -> hash of (front, back) for notes already known to be clean, one JSON object per line
+CLEANED_HASHES_PATH = ".anki_cleaner_hashes.jsonl"
+
+# Patterns shared by every CardCleaner call, compiled once at import
+_TAG_RE = re.compile(r'(<[^>]+>)')
+_ITALIC_TAG_RE = re.compile(r'(<\/?i\b[^>]*>)', re.IGNORECASE)
+_PA_PAREN_RE = re.compile(r'(\(\s*på\b[^)]*\))', re.IGNORECASE)
+_WORD_RE = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+", re.UNICODE)
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+# A double- or single-quoted run; the other quote character is literal inside it
+_QUOTED_RUN_RE = re.compile(r'"([^"]*)("|\Z)|\'([^\']*)(\'|\Z)')
+_SPAN_RE = re.compile(r'(<span\b[^>]*>.*?</span>)', re.IGNORECASE | re.DOTALL)
+_SOUND_RE = re.compile(r'\s*\[sound:[^\]]+\]\s*', re.IGNORECASE)
+_TRAILING_COUNT_RE = re.compile(r'\s*\(\d+\)\s*$')
+_COUNT_SUFFIX_RE = re.compile(r'\s*\(\d+\)$')
+_ARTICLE_RE = re.compile(r'^(en|ett|att)\s+', re.IGNORECASE)
+_GRAY_HEX_RE = re.compile(r'color\s*:\s*#c2c2c2\b', re.IGNORECASE)
+_GRAY_RGB_RE = re.compile(r'color\s*:\s*rgb\(\s*194\s*,\s*194\s*,\s*194\s*\)\s*;?', re.IGNORECASE)
+_GRAY_HEX_VALUE_RE = re.compile(r'#c2c2c2', re.IGNORECASE)
+_GRAY_RGB_VALUE_RE = re.compile(r'rgb\(\s*194\s*,\s*194\s*,\s*194\s*\)\s*;?', re.IGNORECASE)
+_COLOR_DECL_RE = re.compile(r'color\s*:\s*([^;]+)\s*;?', re.IGNORECASE)
+_COLOR_DECL_STRIP_RE = re.compile(r'color\s*:\s*[^;]+\s*;?', re.IGNORECASE)
+_DOUBLE_SEMICOLON_RE = re.compile(r';\s*;')
+_SPAN_STYLE_RE = re.compile(r'<span\b([^>]*?)\bstyle=(?:"([^"]*)"|\'([^\']*)\')([^>]*)>', re.IGNORECASE)
+_NUMBERED_SPLIT_RE = re.compile(r'<br><br>(?=\d+\.\s)')
+_NUMBER_PREFIX_RE = re.compile(r'^\d+\.\s*')
+_TEX_IN_SPAN_RE = re.compile(r'(<span\b[^>]*>)\s*t\.ex\.\s*("([^"]*)")\s*</span>', re.IGNORECASE)
+_BR_RUN_RE = re.compile(r'(?:<br>)+')
+_PAREN_EXAMPLE_RE = re.compile(r'^(.*)\(\s*(["\	\'].*)$')
+_TEX_QUOTED_SPLIT_RE = re.compile(r'\(t\.ex\.\s*"([^"]*)"\)', re.IGNORECASE)
+_TEX_PAREN_RE = re.compile(r'^\s*(.*?)\(\s*t\.ex\.\s*(.*?)\)\s*$', re.IGNORECASE)
+_TEX_QUOTE_OPEN_RE = re.compile(r'\(t\.ex\.\s*"', re.IGNORECASE)
+_TRAILING_PAREN_RE = re.compile(r'\)$')
+_ORDET_ANV_RE = re.compile(r'^ordet\s+anv\w*\b', re.IGNORECASE)
+_DOUBLE_BREAK_RE = re.compile(r'<br>\s*<br>')
+_OR_BREAK_RE = re.compile(r'<br>\s*Or,?\s*')
+_QUOTE_TRAILING_PUNCT_RE = re.compile(r'(["\'])\s*[,)]\s*$')
+_QUOTE_COMMA_SEP_RE = re.compile(r'(["\'])\s*,\s*\1')
+# The entities cards actually contain; anything else falls back to html.unescape
+_COMMON_ENTITY_RE = re.compile(r'&(amp|lt|gt|quot|apos|nbsp|#39|#x27);')
+_COMMON_ENTITIES = {
+    'amp': '&',
+    'lt': '<',
+    'gt': '>',
+    'quot': '"',
+    'apos': "'",
+    'nbsp': '\u00A0',
+    '#39': "'",
+    '#x27': "'",
+}
+_SPACE_LIKE_CHARS = str.maketrans({'\u00A0': ' ', '\u00AD': ' '})
+
+# Anything clean_card could rewrite; fields matching neither skip the full pipeline.
+# Leading whitespace on a line is stripped, as are entities, NBSP and soft hyphens.
+_FRONT_NEEDS_CLEANING_RE = re.compile('[&\u00A0\u00AD]')
+_BACK_NEEDS_CLEANING_RE = re.compile(
+    r'[&"\'(\u00A0\u00AD]|<span|t\.ex|or,|<br><br>\d+\.\s|<br>\s',
+    re.IGNORECASE,
+)
+_SYNONYM_OR_EXTRA_RE = re.compile(
+    r'^\((?:'
+    r'syn:'                  # (syn: something)
+    r'|best:'                # (best: something)
+    r'|pl:'                  # (pl: something)
+    r'|på'                   # (på something: something)
+    r'|(?:en|ett) [^)]+[:)]'  # (en/ett something: English translation) or (en/ett something)
+    r')',
+    re.IGNORECASE,
+)
+# The usual lowercase spellings of the literal alternatives above
+_SYNONYM_OR_EXTRA_PREFIXES = ('(syn:', '(best:', '(pl:', '(på')
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# {"error": message} as _json_dumps lays it out, keyed by indent
+_JSON_ERROR_WRAPPERS = {
+    False: (b'{"error":', b'}'),
+    True: (b'{\n  "error": ', b'\n}'),
+}
+
+
+def _tokenize_html(html_text: str) -> Iterator[Tuple[str, str]]:
+    """Yield ('tag', text) and ('text', text) tokens in one linear scan
+
+    Tags are split the same way as r'<[^>]+>': a '<' followed by at least one
+    character and the next '>'.
+    """
+    pos = 0
+    i = html_text.find('<')
+    while i != -1:
+        j = html_text.find('>', i + 1)
+        if j == -1:
+            break
+        if j == i + 1:
+            i = html_text.find('<', i + 1)
+            continue
+
+        if i > pos:
+            yield 'text', html_text[pos:i]
+        yield 'tag', html_text[i:j + 1]
+        pos = j + 1
+        i = html_text.find('<', pos)
+
+    if pos < len(html_text):
+        yield 'text', html_text[pos:]
+
+
+def _unescape_html(text: str) -> str:
+    """html.unescape, with a fast path when every '&' starts a common entity"""
+    if '&' not in text:
+        return text
+
+    unescaped, count = _COMMON_ENTITY_RE.subn(lambda m: _COMMON_ENTITIES[m.group(1)], text)
+    if count == text.count('&'):
+        return unescaped
+    # Unescape the original, not the partial result, so '&amp;lt;' isn't decoded twice
+    return html.unescape(text)
+
+
+@lru_cache(maxsize=64)
+def _is_gray_span_open_tag(open_tag: str) -> bool:
+    # A deck only uses a handful of distinct span styles, so this is nearly always a cache hit
+    if open_tag[:5].lower() != '<span':
+        return False
+    return bool(_GRAY_HEX_RE.search(open_tag) or _GRAY_RGB_RE.search(open_tag))
+
+
+def _is_gray_color_value(value: str) -> bool:
+    if not value:
+        return False
+    value = value.strip()
+    return bool(_GRAY_HEX_VALUE_RE.fullmatch(value) or _GRAY_RGB_VALUE_RE.fullmatch(value))
+
+
+@lru_cache(maxsize=128)
+def _normalize_span_style(style: str) -> str:
+    """Force a span's style attribute to the gray example color, keeping other declarations"""
+    # Cached because a deck repeats the same few style strings on every span
+    m = _COLOR_DECL_RE.search(style)
+    if not m:
+        return style
+
+    color_value = m.group(1).strip()
+    if _is_gray_color_value(color_value):
+        return style
+
+    without_color = _COLOR_DECL_STRIP_RE.sub('', style).strip()
+    without_color = _DOUBLE_SEMICOLON_RE.sub(';', without_color)
+    without_color = without_color.strip(' ;')
+
+    if without_color:
+        return f'color: rgb(194, 194, 194); {without_color}'
+    return 'color: rgb(194, 194, 194)'
 
 
 class AnkiConnector:
@@ -31,15 +240,22 @@ class AnkiConnector:
 
     def __init__(self, url="http://localhost:8765"):
         self.url = url
+        # Reuse keep-alive connections instead of a new TCP connection per action
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self._deck_names: Optional[List[str]] = None
+        self._deck_names_time = 0.0
+        self._deck_names_lock = threading.Lock()
 
     def request(self, action: str, **params):
         """Send request to AnkiConnect"""
         payload = {"action": action, "version": 6, "params": params}
 
         try:
-            response: requests.Response = requests.post(self.url, json=payload)
+            response: requests.Response = self.session.post(self.url, data=_json_dumps(payload))
             response.raise_for_status()
-            result = response.json()
+            # Parse the raw bytes; response.json() would decode them to str first
+            result = _json_loads(response.content)
 
             if result.get("error"):
                 raise Exception(f"AnkiConnect error: {result['error']}")
@@ -50,9 +266,15 @@ class AnkiConnector:
                 "Cannot connect to Anki. Make sure Anki is running with AnkiConnect add-on installed."
             )
 
-    def get_deck_names(self) -> List[str]:
-        """Get all deck names"""
-        return self.request("deckNames")
+    def get_deck_names(self, max_age: float = DECK_NAMES_MAX_AGE) -> List[str]:
+        """Get all deck names, reusing a lookup made in the last max_age seconds"""
+        # Concurrent web requests wait for one in-flight lookup rather than each sending their own
+        with self._deck_names_lock:
+            now = time.monotonic()
+            if self._deck_names is None or now - self._deck_names_time > max_age:
+                self._deck_names = self.request("deckNames")
+                self._deck_names_time = now
+            return self._deck_names
 
     def get_cards_in_deck(self, deck_name: str) -> List[int]:
         """Get all card IDs in a deck"""
@@ -74,9 +296,29 @@ class AnkiConnector:
         params = {"note": {"id": note_id, "fields": fields}}
         return self.request("updateNoteFields", **params)
 
+    def update_note_fields_many(self, updates: List[Tuple[int, Dict[str, str]]]) -> List[Optional[str]]:
+        """Update several notes' fields in a single multi request, returning
+        each update's error, or None for those that were applied"""
+        actions = [
+            {"action": "updateNoteFields", "params": {"note": {"id": note_id, "fields": fields}}}
+            for note_id, fields in updates
+        ]
+        return [self.multi_error(result) for result in self.multi(actions)]
+
     def multi(self, actions: List[Dict]) -> List:
         return self.request("multi", actions=actions)
 
+    @staticmethod
+    def multi_error(result) -> Optional[str]:
+        """The error of one action's result from multi, or None if it succeeded
+
+        multi doesn't fail when one of its actions does; that action's result
+        is {"result": None, "error": ...} instead.
+        """
+        if isinstance(result, dict) and result.get("error"):
+            return result["error"]
+        return None
+
     def get_model_names(self) -> List[str]:
         """Get all model names"""
         return self.request("modelNames")
@@ -101,19 +343,24 @@ class CardCleaner:
         # Pattern to match RGB colors
         self.rgb_pattern = re.compile(r'rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)')
 
-        self._italic_terms = []
         self._italic_article = None
+        self._italic_terms_re = None
+        self._italic_terms_lower = ()
+        # (line, italic pattern, article) -> styled line; example and synonym lines recur
+        # across cards and on every rescan of cards whose changes weren't applied
+        self._gray_line_cache: Dict[Tuple[str, Optional[re.Pattern], Optional[str]], str] = {}
 
     def _set_italic_terms_from_front(self, front: str) -> None:
         text = '' if front is None else str(front)
-        text = re.sub(r'\s*\[sound:[^\]]+\]\s*', ' ', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s*\(\d+\)\s*$', '', text).strip()
+        text = _SOUND_RE.sub(' ', text)
+        text = _TRAILING_COUNT_RE.sub('', text).strip()
 
-        m = re.match(r'^(en|ett|att)\s+', text, flags=re.IGNORECASE)
+        m = _ARTICLE_RE.match(text)
         self._italic_article = (m.group(1).lower() if m else None)
-        text = re.sub(r'^(?:en|ett|att)\s+', '', text, flags=re.IGNORECASE).strip()
+        text = _ARTICLE_RE.sub('', text).strip()
         if not text:
-            self._italic_terms = []
+            self._italic_terms_re = None
+            self._italic_terms_lower = ()
             return
 
         terms = []
@@ -126,144 +373,77 @@ class CardCleaner:
                 terms.append((stem, True))
 
         terms.sort(key=lambda t: len(t[0]), reverse=True)
-        self._italic_terms = terms
+        self._italic_terms_lower = tuple(term.lower() for term, _ in terms)
+
+        # One alternation per card, longest term first, so each text token is scanned once
+        if ' ' in text:
+            pattern = r'(?<!\w)' + re.escape(text) + r'(?!\w)'
+        else:
+            alternatives = '|'.join(
+                re.escape(term) + (r'\w{0,3}' if allow_suffix else '')
+                for term, allow_suffix in terms
+            )
+            if self._italic_article == 'att':
+                lookbehind = r'(?<!\ben\s)(?<!\bett\s)'
+            elif self._italic_article in ('en', 'ett'):
+                lookbehind = r'(?<!\batt\s)'
+            else:
+                lookbehind = ''
+            pattern = lookbehind + r'\b(?:' + alternatives + r')\b'
+        self._italic_terms_re = re.compile(pattern, re.IGNORECASE)
 
     def _italicize_current_terms(self, html_text: str) -> str:
-        if not self._italic_terms:
+        term_re = self._italic_terms_re
+        if term_re is None:
             return html_text
 
-        tag_re = re.compile(r'(<[^>]+>)')
-        parts = tag_re.split(html_text)
-        out = []
-        in_i = False
-
-        for part in parts:
-            if part is None or part == '':
-                continue
-
-            if tag_re.fullmatch(part):
-                lower = part.lower()
-                if lower.startswith('<i'):
-                    in_i = True
-                elif lower.startswith('</i'):
-                    in_i = False
-                out.append(part)
-                continue
-
-            if in_i:
-                out.append(part)
-                continue
-
-            text_part = part
-
-            italic_tag_re = re.compile(r'(<\/?i\b[^>]*>)', re.IGNORECASE)
-            pa_paren_re = re.compile(r'(\(\s*på\b[^)]*\))', re.IGNORECASE)
-
-            only_within_quotes = (self._italic_article == 'att')
-
-            def apply_inside_quotes(source: str, fn) -> str:
-                out_chars = []
-                buf = []
-                quote = None
-
-                for ch in source:
-                    if ch in ('"', "'"):
-                        if quote is None:
-                            out_chars.append(''.join(buf))
-                            buf = []
-                            quote = ch
-                            out_chars.append(ch)
-                        elif ch == quote:
-                            out_chars.append(fn(''.join(buf)))
-                            buf = []
-                            quote = None
-                            out_chars.append(ch)
-                        else:
-                            buf.append(ch)
-                    else:
-                        buf.append(ch)
-
-                if quote is None:
-                    out_chars.append(''.join(buf))
-                else:
-                    out_chars.append(fn(''.join(buf)))
-
-                return ''.join(out_chars)
+        # Most fragments never mention the word, so skip tokenizing when no term can match
+        lowered = html_text.lower()
+        if not any(term in lowered for term in self._italic_terms_lower):
+            return html_text
 
-            def apply_outside_i(source: str, pattern: str) -> str:
-                sub_parts = italic_tag_re.split(source)
-                sub_out = []
-                in_i_local = False
-                for sub in sub_parts:
-                    if not sub:
-                        continue
-                    if italic_tag_re.fullmatch(sub):
-                        if sub.lower().startswith('<i'):
-                            in_i_local = True
-                        elif sub.lower().startswith('</i'):
-                            in_i_local = False
-                        sub_out.append(sub)
-                        continue
+        def italicize(text: str) -> str:
+            chunks = _PA_PAREN_RE.split(text)
+            if len(chunks) == 1:
+                return term_re.sub(r'<i>\g<0></i>', text)
 
-                    if in_i_local:
-                        sub_out.append(sub)
-                    else:
-                        def do_sub(s: str) -> str:
-                            chunks = pa_paren_re.split(s)
-                            if len(chunks) == 1:
-                                return re.sub(
-                                    pattern,
-                                    lambda m: f'<i>{m.group(0)}</i>',
-                                    s,
-                                    flags=re.IGNORECASE,
-                                )
-
-                            out_chunks: List[str] = []
-                            for chunk in chunks:
-                                if not chunk:
-                                    continue
-                                if pa_paren_re.fullmatch(chunk):
-                                    out_chunks.append(chunk)
-                                else:
-                                    out_chunks.append(
-                                        re.sub(
-                                            pattern,
-                                            lambda m: f'<i>{m.group(0)}</i>',
-                                            chunk,
-                                            flags=re.IGNORECASE,
-                                        )
-                                    )
-                            return ''.join(out_chunks)
-
-                        if only_within_quotes:
-                            sub_out.append(apply_inside_quotes(sub, do_sub))
-                        else:
-                            sub_out.append(do_sub(sub))
-
-                return ''.join(sub_out)
-
-            for term, allow_suffix in self._italic_terms:
-                if not term:
+            out_chunks: List[str] = []
+            for chunk in chunks:
+                if not chunk:
                     continue
-
-                if ' ' in term:
-                    pattern = r'(?<!\w)' + re.escape(term) + r'(?!\w)'
+                if _PA_PAREN_RE.fullmatch(chunk):
+                    out_chunks.append(chunk)
                 else:
-                    if allow_suffix:
-                        base = r'\b' + re.escape(term) + r'\w{0,3}\b'
-                    else:
-                        base = r'\b' + re.escape(term) + r'\b'
+                    out_chunks.append(term_re.sub(r'<i>\g<0></i>', chunk))
+            return ''.join(out_chunks)
 
-                    if self._italic_article == 'att':
-                        pattern = r'(?<!\ben\s)(?<!\bett\s)' + base
-                    elif self._italic_article in ('en', 'ett'):
-                        pattern = r'(?<!\batt\s)' + base
-                    else:
-                        pattern = base
-
-                text_part = apply_outside_i(text_part, pattern)
+        only_within_quotes = (self._italic_article == 'att')
 
-            out.append(text_part)
+        out = []
+        in_i = False
+        for kind, token in _tokenize_html(html_text):
+            if kind == 'tag':
+                # Only the tag name matters, so avoid lowercasing long attribute strings
+                lower = token[:3].lower()
+                if lower.startswith('<i'):
+                    in_i = True
+                elif lower.startswith('</i'):
+                    in_i = False
+                out.append(token)
+            elif in_i:
+                out.append(token)
+            elif not only_within_quotes:
+                out.append(italicize(token))
+            else:
+                # Only quoted text is italicized; an unterminated quote runs to the end of the token
+                out.append(_QUOTED_RUN_RE.sub(
+                    lambda m: (
+                        f'"{italicize(m.group(1))}{m.group(2)}'
+                        if m.group(2) is not None
+                        else f"'{italicize(m.group(3))}{m.group(4)}"
+                    ),
+                    token,
+                ))
 
         return ''.join(out)
 
@@ -276,33 +456,19 @@ class CardCleaner:
             return None
 
         open_tag = span_html[:gt + 1]
-        if not open_tag.lower().startswith('<span'):
-            return None
-
-        if re.search(r'color\s*:\s*#c2c2c2\b', open_tag, flags=re.IGNORECASE):
-            return open_tag
-
-        if re.search(
-            r'color\s*:\s*rgb\(\s*194\s*,\s*194\s*,\s*194\s*\)\s*;?',
-            open_tag,
-            flags=re.IGNORECASE,
-        ):
-            return open_tag
-
-        return None
+        return open_tag if _is_gray_span_open_tag(open_tag) else None
 
     def _wrap_gray_span(self, inner: str) -> str:
         return f'<span style="color: rgb(194, 194, 194)">{inner}</span>'
 
     def _italicize_repeated_quoted_word(self, text: str) -> str:
-        quoted = re.findall(r'"([^"]+)"', text)
+        quoted = _QUOTED_RE.findall(text)
         if len(quoted) < 2:
             return text
 
-        word_pattern = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+", re.UNICODE)
         per_quote_words = []
         for q in quoted:
-            per_quote_words.append({w.lower() for w in word_pattern.findall(q)})
+            per_quote_words.append({w.lower() for w in _WORD_RE.findall(q)})
 
         counts = {}
         for words in per_quote_words:
@@ -317,18 +483,18 @@ class CardCleaner:
         candidates = [w for w in candidates if len(w) == max_len]
 
         def wrap_outside_i(source: str, word: str) -> str:
-            tag_re = re.compile(r'(<\/?i\b[^>]*>)', re.IGNORECASE)
-            parts = tag_re.split(source)
+            parts = _ITALIC_TAG_RE.split(source)
             out = []
             in_i = False
             word_re = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
             for part in parts:
                 if not part:
                     continue
-                if tag_re.fullmatch(part):
-                    if part.lower().startswith('<i'):
+                if _ITALIC_TAG_RE.fullmatch(part):
+                    lower = part[:3].lower()
+                    if lower.startswith('<i'):
                         in_i = True
-                    elif part.lower().startswith('</i'):
+                    elif lower.startswith('</i'):
                         in_i = False
                     out.append(part)
                     continue
@@ -351,19 +517,24 @@ class CardCleaner:
         Returns:
             Tuple of (new_front, new_back, changed) where changed indicates if any modifications were made
         """
+        # Plain text with nothing to decode, split, unwrap or gray out comes back unchanged
+        if (
+            not _FRONT_NEEDS_CLEANING_RE.search(front)
+            and not _BACK_NEEDS_CLEANING_RE.search(back)
+            and back == back.strip()
+        ):
+            return front, back, False
+
         original_front = front
         original_back = back
         changed = False
 
-        # Step 1: Decode HTML entities
-        back = html.unescape(back)
-        front = html.unescape(front)
-
-        back = back.replace('\u00A0', ' ')
-        front = front.replace('\u00A0', ' ')
+        # Step 1: Decode HTML entities, then turn NBSP and soft hyphens into spaces in one pass
+        back = _unescape_html(back)
+        front = _unescape_html(front)
 
-        back = back.replace('\u00AD', ' ')
-        front = front.replace('\u00AD', ' ')
+        back = back.translate(_SPACE_LIKE_CHARS)
+        front = front.translate(_SPACE_LIKE_CHARS)
 
         self._set_italic_terms_from_front(front)
 
@@ -389,7 +560,7 @@ class CardCleaner:
             # Step 5: Update front field with definition count if > 1
             if def_count > 1:
                 # Remove existing count if present
-                front = re.sub(r'\s*\(\d+\)$', '', front)
+                front = _COUNT_SUFFIX_RE.sub('', front)
                 front = f"{front} ({def_count})"
             
             # Check if anything changed
@@ -398,8 +569,9 @@ class CardCleaner:
             return front, back, changed
 
         finally:
-            self._italic_terms = []
             self._italic_article = None
+            self._italic_terms_re = None
+            self._italic_terms_lower = ()
 
     def _extract_definitions(self, back: str) -> List[str]:
         """Extract individual definitions from the back field"""
@@ -407,13 +579,13 @@ class CardCleaner:
         
         # First try to split by numbered definitions
         # Look for pattern like "1. ...<br><br>2. ..."
-        parts = re.split(r'<br><br>(?=\d+\.\s)', back)
+        parts = _NUMBERED_SPLIT_RE.split(back)
         
         if len(parts) > 1:
             # We have numbered definitions
             for part in parts:
                 # Remove the number prefix if present
-                part = re.sub(r'^\d+\.\s*', '', part.strip())
+                part = _NUMBER_PREFIX_RE.sub('', part.strip())
                 if part:
                     definitions.append(part)
         else:
@@ -429,43 +601,41 @@ class CardCleaner:
 
     def _clean_definition(self, definition: str, is_main: bool) -> str:
         """Clean a single definition"""
+        # Normalising is idempotent and the steps below never add span tags, so once is enough
         definition = self._normalize_gray_span_styles(definition)
 
         # First, handle t.ex. inside spans - remove t.ex. but keep the span and the quote
-        definition = re.sub(
-            r'(<span\b[^>]*>)\s*t\.ex\.\s*("([^"]*)")\s*</span>',
-            r'\1\2</span>',
-            definition,
-            flags=re.IGNORECASE,
-        )
-        definition = self._normalize_gray_span_styles(definition)
-
-        span_re = re.compile(r'(<span\b[^>]*>.*?</span>)', re.IGNORECASE | re.DOTALL)
-        tokens = span_re.split(definition)
+        definition = _TEX_IN_SPAN_RE.sub(r'\1\2</span>', definition)
 
         out: List[str] = []
-        for token in tokens:
-            if not token:
-                continue
+        # Whether anything but <br> and whitespace precedes the current span; tracked per piece
+        # instead of re-joining and re-scanning the whole prefix at every span
+        prefix_has_text = False
+        pos = 0
+        for m in _SPAN_RE.finditer(definition):
+            if m.start() > pos:
+                piece = self._process_content_outside_spans(definition[pos:m.start()], is_main)
+                out.append(piece)
+                prefix_has_text = prefix_has_text or bool(_BR_RUN_RE.sub('', piece).strip())
+            pos = m.end()
+
+            # Preserve the entire span (spans can legitimately include <br> and <br><br>)
+            span_html = m.group(0)
+
+            open_tag = self._gray_span_open_tag(span_html)
+            if open_tag and span_html.endswith('</span>'):
+                inner = span_html[len(open_tag):-len('</span>')]
+                inner = self._normalize_quoted_example_lines(inner)
+                inner = self._italicize_current_terms(inner)
+                span_html = f'{open_tag}{inner}</span>'
 
-            if span_re.fullmatch(token):
-                # Preserve the entire span (spans can legitimately include <br> and <br><br>)
-                span_html = self._normalize_gray_span_styles(token)
-
-                open_tag = self._gray_span_open_tag(span_html)
-                if open_tag and span_html.endswith('</span>'):
-                    inner = span_html[len(open_tag):-len('</span>')]
-                    inner = self._normalize_quoted_example_lines(inner)
-                    inner = self._italicize_current_terms(inner)
-                    span_html = f'{open_tag}{inner}</span>'
-
-                prefix = ''.join(out)
-                prefix_text = re.sub(r'(?:<br>)+', '', prefix).strip()
-                allow_split = bool(prefix_text)
-                span_html = self._maybe_split_gray_span_on_double_break(span_html, allow_split=allow_split)
-                out.append(span_html)
-            else:
-                out.append(self._process_content_outside_spans(token, is_main))
+            span_html = self._maybe_split_gray_span_on_double_break(span_html, allow_split=prefix_has_text)
+            out.append(span_html)
+            # The span's own markup counts as text for any later span
+            prefix_has_text = True
+
+        if pos < len(definition):
+            out.append(self._process_content_outside_spans(definition[pos:], is_main))
 
         return ''.join(out)
     
@@ -473,18 +643,30 @@ class CardCleaner:
         """Process content that's not inside spans"""
         # Split by <br> to process lines
         lines = content.split('<br>')
+        # Lines are looked ahead at from the previous line as well, so strip each only once
+        stripped_lines = [line.strip() for line in lines]
         processed_lines = []
 
         idx = 0
         while idx < len(lines):
             line = lines[idx].lstrip()
-            stripped = line.strip()
+            stripped = stripped_lines[idx]
             if not stripped:
                 processed_lines.append('')
                 idx += 1
                 continue
 
-            m = re.match(r'^(.*)\(\s*(["\	\'].*)$', stripped)
+            stripped_lower = stripped.lower()
+            has_paren = '(' in stripped
+
+            # Every branch below needs a parenthesis, a leading t.ex. or a leading quote;
+            # anything else is a plain line, so skip the per-branch regexes
+            if not has_paren and not stripped_lower.startswith('t.ex. ') and not stripped.startswith('"'):
+                processed_lines.append(self._process_line(line, is_main))
+                idx += 1
+                continue
+
+            m = _PAREN_EXAMPLE_RE.match(stripped) if has_paren else None
             if m:
                 def_part = m.group(1).rstrip()
                 example_start = m.group(2).strip()
@@ -492,7 +674,7 @@ class CardCleaner:
                     example_lines = [example_start]
                     next_idx = idx + 1
                     while next_idx < len(lines):
-                        nxt = lines[next_idx].strip()
+                        nxt = stripped_lines[next_idx]
                         if not nxt:
                             break
                         if nxt.startswith(('"', "'")):
@@ -516,8 +698,8 @@ class CardCleaner:
                     continue
 
             # Handle t.ex. patterns
-            if '(t.ex. "' in stripped.lower():
-                parts = re.split(r'\(t\.ex\.\s*"([^"]*)"\)', stripped, flags=re.IGNORECASE)
+            if '(t.ex. "' in stripped_lower:
+                parts = _TEX_QUOTED_SPLIT_RE.split(stripped)
                 if len(parts) > 1:
                     def_part = parts[0].strip()
                     if def_part:
@@ -526,7 +708,7 @@ class CardCleaner:
                     example_inner = f'"{parts[1]}"'
 
                     next_idx = idx + 1
-                    next_line = lines[next_idx].strip() if next_idx < len(lines) else ''
+                    next_line = stripped_lines[next_idx] if next_idx < len(lines) else ''
                     if next_line and self._is_synonym_or_extra(next_line):
                         combined = f'{example_inner}<br>{next_line}'
                         processed_lines.append(self._apply_color_styling(combined, is_gray=True))
@@ -540,7 +722,7 @@ class CardCleaner:
                         if remaining:
                             processed_lines.append(self._apply_color_styling(remaining, is_gray=True))
                 else:
-                    m = re.match(r'^\s*(.*?)\(\s*t\.ex\.\s*(.*?)\)\s*$', stripped, flags=re.IGNORECASE)
+                    m = _TEX_PAREN_RE.match(stripped)
                     if m:
                         def_part = m.group(1).strip()
                         example_part = m.group(2).strip()
@@ -549,7 +731,7 @@ class CardCleaner:
                             processed_lines.append(self._apply_color_styling(def_part, is_gray=False))
 
                         next_idx = idx + 1
-                        next_line = lines[next_idx].strip() if next_idx < len(lines) else ''
+                        next_line = stripped_lines[next_idx] if next_idx < len(lines) else ''
                         if next_line and self._is_synonym_or_extra(next_line):
                             combined = f'{example_part}<br>{next_line}'
                             processed_lines.append(self._apply_color_styling(combined, is_gray=True))
@@ -558,21 +740,18 @@ class CardCleaner:
 
                         processed_lines.append(self._apply_color_styling(example_part, is_gray=True))
                     else:
-                        stripped_line = re.sub(r'\(t\.ex\.\s*"', '"', stripped, flags=re.IGNORECASE)
-                        stripped_line = re.sub(r'\)$', '', stripped_line)
+                        stripped_line = _TEX_QUOTE_OPEN_RE.sub('"', stripped)
+                        stripped_line = _TRAILING_PAREN_RE.sub('', stripped_line)
                         processed_lines.append(self._process_line(stripped_line, is_main))
-            elif stripped.lower().startswith('t.ex. ') and self.example_sentence_pattern.match(stripped[6:]):
-                example = stripped[6:].strip()
-                processed_lines.append(self._apply_color_styling(example, is_gray=True))
-            elif stripped.startswith('t.ex. ') and self.example_sentence_pattern.match(stripped[6:]):
+            elif stripped_lower.startswith('t.ex. ') and stripped.startswith('"', 6):
                 example = stripped[6:].strip()
                 processed_lines.append(self._apply_color_styling(example, is_gray=True))
             else:
-                if self.example_sentence_pattern.match(stripped):
+                if stripped.startswith('"'):
                     next_idx = idx + 1
                     if next_idx < len(lines):
-                        next_line = lines[next_idx].strip()
-                        if next_line and re.match(r'^ordet\s+anv\w*\b', next_line, flags=re.IGNORECASE):
+                        next_line = stripped_lines[next_idx]
+                        if next_line and _ORDET_ANV_RE.match(next_line):
                             example = self._remove_wrapping_parentheses(stripped)
                             combined = f'{example}<br>{next_line}'
                             processed_lines.append(self._apply_color_styling(combined, is_gray=True))
@@ -586,53 +765,17 @@ class CardCleaner:
         return '<br>'.join(processed_lines)
 
     def _normalize_gray_span_styles(self, text: str) -> str:
-        def is_gray_value(value: str) -> bool:
-            if not value:
-                return False
-            if re.fullmatch(r'#c2c2c2', value.strip(), flags=re.IGNORECASE):
-                return True
-            if re.fullmatch(
-                r'rgb\(\s*194\s*,\s*194\s*,\s*194\s*\)\s*;?',
-                value.strip(),
-                flags=re.IGNORECASE,
-            ):
-                return True
-            return False
-
-        def normalize_style(style: str) -> str:
-            m = re.search(r'color\s*:\s*([^;]+)\s*;?', style, flags=re.IGNORECASE)
-            if not m:
-                return style
-
-            color_value = m.group(1).strip()
-            if is_gray_value(color_value):
-                return style
-
-            without_color = re.sub(r'color\s*:\s*[^;]+\s*;?', '', style, flags=re.IGNORECASE).strip()
-            without_color = re.sub(r';\s*;', ';', without_color)
-            without_color = without_color.strip(' ;')
-
-            if without_color:
-                return f'color: rgb(194, 194, 194); {without_color}'
-            return 'color: rgb(194, 194, 194)'
-
-        def repl_double(m: re.Match) -> str:
-            before = m.group(1)
-            style = m.group(2)
-            after = m.group(3)
-            new_style = normalize_style(style)
-            return f'<span{before}style="{new_style}"{after}>'
-
-        def repl_single(m: re.Match) -> str:
+        def repl(m: re.Match) -> str:
             before = m.group(1)
-            style = m.group(2)
-            after = m.group(3)
-            new_style = normalize_style(style)
+            after = m.group(4)
+            if m.group(2) is not None:
+                new_style = _normalize_span_style(m.group(2))
+                return f'<span{before}style="{new_style}"{after}>'
+            new_style = _normalize_span_style(m.group(3))
             return f"<span{before}style='{new_style}'{after}>"
 
-        text = re.sub(r'<span\b([^>]*?)\bstyle="([^"]*)"([^>]*)>', repl_double, text, flags=re.IGNORECASE)
-        text = re.sub(r"<span\b([^>]*?)\bstyle='([^']*)'([^>]*)>", repl_single, text, flags=re.IGNORECASE)
-        return text
+        # Double- and single-quoted style attributes in one pass
+        return _SPAN_STYLE_RE.sub(repl, text)
 
     def _maybe_split_gray_span_on_double_break(self, span_html: str, allow_split: bool) -> str:
         if not allow_split:
@@ -669,7 +812,7 @@ class CardCleaner:
         definitions = []
         
         # First, split by double <br> which indicates separate definitions
-        parts = re.split(r'<br>\s*<br>', content)
+        parts = _DOUBLE_BREAK_RE.split(content)
         
         for part in parts:
             part = part.strip()
@@ -679,7 +822,7 @@ class CardCleaner:
             # Check if this part has "Or, " separators
             if '<br>Or, ' in part or '<br>Or,' in part:
                 # Split by Or, and add each as a separate definition
-                or_parts = re.split(r'<br>\s*Or,?\s*', part)
+                or_parts = _OR_BREAK_RE.split(part)
                 for or_part in or_parts:
                     or_part = or_part.strip()
                     if or_part:
@@ -702,12 +845,12 @@ class CardCleaner:
         if line.startswith('<span') and line.endswith('</span>') and self._gray_span_open_tag(line):
             return self._apply_color_styling(line, is_gray=True)
 
-        if self.example_sentence_pattern.match(line):
+        if line.startswith('"'):
             line = self._normalize_quoted_example_lines(line)
             return self._apply_color_styling(line, is_gray=True)
 
         maybe_unwrapped = self._remove_wrapping_parentheses(line)
-        if maybe_unwrapped != line and self.example_sentence_pattern.match(maybe_unwrapped.strip()):
+        if maybe_unwrapped != line and maybe_unwrapped.strip().startswith('"'):
             line = self._normalize_quoted_example_lines(maybe_unwrapped)
             return self._apply_color_styling(line, is_gray=True)
 
@@ -740,12 +883,9 @@ class CardCleaner:
 
             lead = normalized.strip()
             if lead.startswith(('"', "'")):
-                normalized = re.sub(r'"\s*,\s*$', '"', normalized)
-                normalized = re.sub(r"'\s*,\s*$", "'", normalized)
-                normalized = re.sub(r'"\s*\)\s*$', '"', normalized)
-                normalized = re.sub(r"'\s*\)\s*$", "'", normalized)
-                normalized = re.sub(r'"\s*,\s*"', '"<br>"', normalized)
-                normalized = re.sub(r"'\s*,\s*'", "'<br>'", normalized)
+                # Drop a comma or paren after the closing quote, then split "a", "b" onto lines
+                normalized = _QUOTE_TRAILING_PUNCT_RE.sub(r'\1', normalized)
+                normalized = _QUOTE_COMMA_SEP_RE.sub(r'\1<br>\1', normalized)
 
             out.append(normalized)
 
@@ -753,29 +893,29 @@ class CardCleaner:
 
     def _is_synonym_or_extra(self, line: str) -> bool:
         """Check if a line is a synonym or extra information"""
-        # Check for common patterns
-        synonym_patterns = [
-            r'^\(syn:',          # (syn: something)
-            r'^\(best:',         # (best: something)
-            r'^\(pl:',           # (pl: something)
-            r'^\(på',            # (på something: something)
-            r'^\(en [^)]+:',     # (en something: English translation)
-            r'^\(ett [^)]+:',    # (ett something: English translation)
-            r'^\(ett [^)]+\)',   # (ett something) without colon
-            r'^\(en [^)]+\)',    # (en something) without colon
-        ]
-        
-        for pattern in synonym_patterns:
-            if re.match(pattern, line, re.IGNORECASE):
-                return True
-        
-        return False
+        # Most lines don't open with a paren, and most that do use a literal prefix
+        if not line.startswith('('):
+            return False
+        if line.startswith(_SYNONYM_OR_EXTRA_PREFIXES):
+            return True
+        return _SYNONYM_OR_EXTRA_RE.match(line) is not None
 
     def _apply_color_styling(self, line: str, is_gray: bool) -> str:
         """Apply color styling to a line"""
         if not is_gray:
             return line
 
+        # The compiled term pattern and article fully determine how italicization treats the line
+        key = (line, self._italic_terms_re, self._italic_article)
+        styled = self._gray_line_cache.get(key)
+        if styled is None:
+            if len(self._gray_line_cache) >= GRAY_LINE_CACHE_SIZE:
+                self._gray_line_cache.clear()
+            styled = self._style_gray_line(line)
+            self._gray_line_cache[key] = styled
+        return styled
+
+    def _style_gray_line(self, line: str) -> str:
         if line.startswith('<span') and line.endswith('</span>'):
             open_tag = self._gray_span_open_tag(line)
             if open_tag:
@@ -790,10 +930,17 @@ class CardCleaner:
 
     def _convert_rgb_to_hex(self, text: str) -> str:
         """Convert rgb(r, g, b) colors to hex format"""
+        if 'rgb(' not in text:
+            return text
+
+        def channel_hex(value: str) -> str:
+            n = int(value)
+            return _HEX_BYTES[n] if n < 256 else f"{n:02X}"
+
         def rgb_to_hex(match):
-            r, g, b = map(int, match.groups())
-            return f"#{r:02X}{g:02X}{b:02X}"
-        
+            r, g, b = match.groups()
+            return f"#{channel_hex(r)}{channel_hex(g)}{channel_hex(b)}"
+
         return self.rgb_pattern.sub(rgb_to_hex, text)
 
 
@@ -801,6 +948,17 @@ class WebServer(BaseHTTPRequestHandler):
     """HTTP server to handle web interface requests"""
 
     cleaner = None
+    # Keep connections open between the page's back-to-back API calls; every response
+    # sets Content-Length (or is chunked) so the browser knows where it ends
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # Requests are served on separate threads; POSTs that drive the cleaner take this
+    # lock so a long batch never overlaps another, while GETs stay concurrent.
+    _work_lock = threading.Lock()
+    _interface_html_bytes: Optional[bytes] = None
+    _interface_html_gzip: Optional[bytes] = None
+    # Endpoint -> ((payload key, pretty), bytes) for responses that rarely change
+    _json_cache: Dict[str, Tuple[Tuple, bytes]] = {}
 
     def do_GET(self):
         """Handle GET requests"""
@@ -839,15 +997,16 @@ class WebServer(BaseHTTPRequestHandler):
 
         try:
             content_length = int(self.headers.get("Content-Length", 0))
-            post_data = self.rfile.read(content_length).decode("utf-8")
-            data = json.loads(post_data) if post_data else {}
-
-            if path == "/api/process":
-                self.handle_process_request(data)
-            elif path == "/api/apply":
-                self.handle_apply_request(data)
-            else:
-                self.send_error(404)
+            post_data = self.rfile.read(content_length)
+            data = _json_loads(post_data) if post_data else {}
+
+            with self._work_lock:
+                if path == "/api/process":
+                    self.handle_process_request(data)
+                elif path == "/api/apply":
+                    self.handle_apply_request(data)
+                else:
+                    self.send_error(404)
         except Exception as e:
             if isinstance(e, (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)):
                 return
@@ -866,14 +1025,23 @@ class WebServer(BaseHTTPRequestHandler):
 
     def serve_interface(self):
         """Serve the main HTML interface"""
-        html_content = self.get_interface_html()
-
-        self.send_response(200)
-        self.send_header("Content-type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(html_content.encode("utf-8"))))
-        self.send_header("Cache-Control", "no-cache, no-store, must-revalidate")
-        self.end_headers()
-        self.wfile.write(html_content.encode("utf-8"))
+        # The page is static, so encode and compress it once for the server's lifetime
+        cls = type(self)
+        if cls._interface_html_bytes is None:
+            cls._interface_html_bytes = self.get_interface_html().encode("utf-8")
+            cls._interface_html_gzip = gzip.compress(cls._interface_html_bytes, 9)
+
+        use_gzip = self._accepts_gzip()
+        body = cls._interface_html_gzip if use_gzip else cls._interface_html_bytes
+
+        headers = [
+            ("Content-type", "text/html; charset=utf-8"),
+            ("Vary", "Accept-Encoding"),
+            ("Cache-Control", "no-cache, no-store, must-revalidate"),
+        ]
+        if use_gzip:
+            headers.append(("Content-Encoding", "gzip"))
+        send_response_with_body(self, 200, headers, body)
 
     def serve_decks(self):
         """Serve list of available decks"""
@@ -883,7 +1051,7 @@ class WebServer(BaseHTTPRequestHandler):
 
             decks = self.cleaner.anki.get_deck_names()
             response = {"decks": decks}
-            self.send_json_response(response)
+            self.send_json_response(response, cache_key=("decks", tuple(decks)))
         except Exception as e:
             print(f"Error getting decks: {e}")
             self.send_json_error(500, str(e))
@@ -898,12 +1066,12 @@ class WebServer(BaseHTTPRequestHandler):
         # Test Anki connection
         try:
             if self.cleaner:
-                self.cleaner.anki.get_deck_names()
+                self.cleaner.anki.get_deck_names(max_age=STATUS_MAX_AGE)
                 response["anki_connected"] = True
         except Exception as e:
             print(f"Anki connection failed: {e}")
 
-        self.send_json_response(response)
+        self.send_json_response(response, cache_key=("status", *response.values()))
 
     def handle_process_request(self, data):
         """Handle card processing request"""
@@ -918,6 +1086,10 @@ class WebServer(BaseHTTPRequestHandler):
             if not self.cleaner:
                 raise Exception("Cleaner not initialized")
 
+            if data.get("stream"):
+                self.send_ndjson_stream(self.cleaner.iter_cards_for_review(deck_name, batch_size, start_from))
+                return
+
             results = self.cleaner.process_cards_for_review(deck_name, batch_size, start_from)
             self.send_json_response(results)
 
@@ -938,37 +1110,113 @@ class WebServer(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_json_error(500, str(e))
 
+    def _wants_pretty_json(self) -> bool:
+        """The web UI only parses responses; add ?pretty=1 to read them in a browser"""
+        return parse_qs(urlparse(self.path).query).get("pretty") == ["1"]
+
     def send_json_error(self, status_code: int, message: str):
         """Send a JSON error response"""
-        response_data = json.dumps({"error": message}, ensure_ascii=False, indent=2)
-        response_bytes = response_data.encode("utf-8")
+        # Only the message varies, so serialize just the string into the fixed wrapper
+        prefix, suffix = _JSON_ERROR_WRAPPERS[self._wants_pretty_json()]
+        response_bytes = prefix + _json_dumps(message) + suffix
+
+        try:
+            send_response_with_body(
+                self,
+                status_code,
+                [("Content-type", "application/json; charset=utf-8"), *CORS_HEADERS],
+                response_bytes,
+            )
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            return
+
+    def send_ndjson_stream(self, items: Iterator[Tuple[str, Dict]]):
+        """Send each (kind, item) pair as a {kind: item} JSON line, one HTTP chunk per line,
+        as soon as it is produced"""
+        # Failures before the first item (e.g. Anki unreachable) still get a normal JSON error
+        first = next(items)
+
+        self.send_response(200)
+        # Each line is flushed through the compressor on its own so the browser can still
+        # decode and render cards as they arrive
+        compressor = zlib.compressobj(1, zlib.DEFLATED, 31) if self._accepts_gzip() else None
+
+        self.send_header("Content-type", "application/x-ndjson; charset=utf-8")
+        if compressor is not None:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        for name, value in CORS_HEADERS:
+            self.send_header(name, value)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write_chunk(data: bytes):
+            if compressor is not None:
+                data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
 
         try:
-            self.send_response(status_code)
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-            self.send_header("Access-Control-Allow-Headers", "Content-Type")
-            self.send_header("Content-Length", str(len(response_bytes)))
-            self.end_headers()
-            self.wfile.write(response_bytes)
+            kind, item = first
+            write_chunk(_json_dumps({kind: item}) + b"\n")
+            for kind, item in items:
+                write_chunk(_json_dumps({kind: item}) + b"\n")
         except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            items.close()
+            self.close_connection = True
             return
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            print(f"Error streaming response: {e}")
+            traceback.print_exc()
+            error_line = _json_dumps({"error": str(e)}) + b"\n"
+        else:
+            error_line = None
 
-    def send_json_response(self, data):
-        """Send JSON response"""
         try:
-            response_data = json.dumps(data, ensure_ascii=False, indent=2)
-
-            self.send_response(200)
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-            self.send_header("Access-Control-Allow-Headers", "Content-Type")
-            response_bytes = response_data.encode("utf-8")
-            self.send_header("Content-Length", str(len(response_bytes)))
-            self.end_headers()
-            self.wfile.write(response_bytes)
+            if error_line is not None:
+                write_chunk(error_line)
+            if compressor is not None:
+                trailer = compressor.flush()
+                self.wfile.write(b"%X\r\n%s\r\n" % (len(trailer), trailer))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            self.close_connection = True
+
+    def _accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def _cached_json_bytes(self, data, cache_key: Tuple) -> bytes:
+        """Serialize data once per distinct cache_key, whose first item names the endpoint"""
+        key = (cache_key, self._wants_pretty_json())
+        cached = self._json_cache.get(cache_key[0])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        response_bytes = _json_dumps(data, indent=key[1])
+        self._json_cache[cache_key[0]] = (key, response_bytes)
+        return response_bytes
+
+    def send_json_response(self, data, cache_key: Optional[Tuple] = None):
+        """Send JSON response, reusing the last serialization for an unchanged cache_key"""
+        try:
+            if cache_key is None:
+                response_bytes = _json_dumps(data, indent=self._wants_pretty_json())
+            else:
+                response_bytes = self._cached_json_bytes(data, cache_key)
+
+            # Card payloads are mostly repetitive HTML; level 1 compresses them well at little CPU cost
+            use_gzip = len(response_bytes) >= GZIP_MIN_BYTES and self._accepts_gzip()
+            if use_gzip:
+                response_bytes = gzip.compress(response_bytes, 1)
+
+            headers = [
+                ("Content-type", "application/json; charset=utf-8"),
+                ("Vary", "Accept-Encoding"),
+                *CORS_HEADERS,
+            ]
+            if use_gzip:
+                headers.append(("Content-Encoding", "gzip"))
+            send_response_with_body(self, 200, headers, response_bytes)
 
         except Exception as e:
             if isinstance(e, (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)):
@@ -979,21 +1227,18 @@ class WebServer(BaseHTTPRequestHandler):
                 error_response = json.dumps(
                     {"error": f"JSON serialization failed: {str(e)}"}
                 )
-                self.send_response(500)
-                self.send_header("Content-type", "application/json; charset=utf-8")
-                self.send_header("Content-Length", str(len(error_response)))
-                self.end_headers()
-                self.wfile.write(error_response.encode("utf-8"))
+                send_response_with_body(
+                    self,
+                    500,
+                    [("Content-type", "application/json; charset=utf-8")],
+                    error_response.encode("utf-8"),
+                )
             except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
                 return
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+        send_response_with_body(self, 200, CORS_HEADERS, b"")
 
     def log_message(self, format, *args):
         """Override to reduce log noise"""
@@ -1038,6 +1283,7 @@ class WebServer(BaseHTTPRequestHandler):
         .progress-meta { margin-top: 10px; color: #94a3b8; font-size: 13px; }
         @keyframes spin { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
         .card { background: #0b1220; border: 1px solid #1f2937; border-radius: 8px; margin-bottom: 20px; overflow: hidden; transition: all 0.3s ease; }
+        .card-slot { display: flow-root; }
         .card:hover { box-shadow: 0 6px 20px rgba(0,0,0,0.35); }
         .card.selected { border-color: rgba(79, 70, 229, 0.7); box-shadow: 0 6px 20px rgba(79, 70, 229, 0.2); }
         .card-header { background: #0f172a; padding: 15px; border-bottom: 1px solid #1f2937; display: flex; align-items: center; justify-content: space-between; }
@@ -1136,6 +1382,7 @@ class WebServer(BaseHTTPRequestHandler):
 
     <script>
         let cardData = [];
+        let cardIndexById = new Map();
         let selectedCards = new Set();
         let skippedCount = 0;
         let currentDeckName = '';
@@ -1155,11 +1402,34 @@ class WebServer(BaseHTTPRequestHandler):
                 .replace(/'/g, '&#039;');
         }
 
-        function renderRawDiff(beforeText, afterText, side) {
+        // Cards are rebuilt as they scroll back into view and edits often return to an
+        // earlier text, so recent diffs are kept (least recently used dropped first)
+        const RAW_DIFF_CACHE_SIZE = 256;
+        const rawDiffCache = new Map();
+
+        function renderRawDiff(beforeText, afterText) {
             const a = String(beforeText ?? '');
             const b = String(afterText ?? '');
+            // The length prefix keeps the key unambiguous without a separator character
+            const key = `${a.length}:${a}${b}`;
+            let result = rawDiffCache.get(key);
+            if (result) {
+                rawDiffCache.delete(key);
+            } else {
+                result = computeRawDiff(a, b);
+                if (rawDiffCache.size >= RAW_DIFF_CACHE_SIZE) {
+                    rawDiffCache.delete(rawDiffCache.keys().next().value);
+                }
+            }
+            rawDiffCache.set(key, result);
+            return result;
+        }
+
+        // Renders both sides of a raw HTML diff from a single diff pass
+        function computeRawDiff(a, b) {
             if (a === b) {
-                return `<span class="diff-unchanged">${escapeHtml(a)}</span>`;
+                const unchanged = `<span class="diff-unchanged">${escapeHtml(a)}</span>`;
+                return { before: unchanged, after: unchanged };
             }
 
             const tokenRe = /(<[^>]+>|&[^;\\s]+;|\\s+|[^<&\\s]+)/g;
@@ -1170,13 +1440,15 @@ class WebServer(BaseHTTPRequestHandler):
                 const N = A.length;
                 const M = B.length;
                 const max = N + M;
-                const offset = max;
+                const offset = max + 1;
 
-                let v = new Array(2 * max + 1).fill(0);
+                const v = new Int32Array(2 * max + 3);
+                // trace[d] keeps only diagonals -d..d as they were before step d, so memory
+                // grows with the square of the edit distance rather than with field length
                 const trace = [];
 
                 for (let d = 0; d <= max; d++) {
-                    const vNew = v.slice();
+                    trace.push(v.slice(offset - d, offset + d + 1));
                     for (let k = -d; k <= d; k += 2) {
                         const kIdx = k + offset;
                         let x;
@@ -1192,37 +1464,33 @@ class WebServer(BaseHTTPRequestHandler):
                             y++;
                         }
 
-                        vNew[kIdx] = x;
+                        v[kIdx] = x;
                         if (x >= N && y >= M) {
-                            trace.push(vNew.slice());
-                            return backtrack(trace, A, B, offset);
+                            return backtrack(trace, A, B);
                         }
                     }
-
-                    trace.push(vNew.slice());
-                    v = vNew;
                 }
 
-                return backtrack(trace, A, B, offset);
+                return backtrack(trace, A, B);
             }
 
-            function backtrack(trace, A, B, offset) {
+            function backtrack(trace, A, B) {
                 let x = A.length;
                 let y = B.length;
                 const ops = [];
 
-                for (let d = trace.length - 1; d >= 0; d--) {
+                for (let d = trace.length - 1; d > 0; d--) {
                     const v = trace[d];
                     const k = x - y;
 
                     let prevK;
-                    if (k === -d || (k !== d && v[k - 1 + offset] < v[k + 1 + offset])) {
+                    if (k === -d || (k !== d && v[k - 1 + d] < v[k + 1 + d])) {
                         prevK = k + 1;
                     } else {
                         prevK = k - 1;
                     }
 
-                    const prevX = d === 0 ? 0 : v[prevK + offset];
+                    const prevX = v[prevK + d];
                     const prevY = prevX - prevK;
 
                     while (x > prevX && y > prevY) {
@@ -1231,10 +1499,6 @@ class WebServer(BaseHTTPRequestHandler):
                         y--;
                     }
 
-                    if (d === 0) {
-                        break;
-                    }
-
                     if (x === prevX) {
                         ops.push({ t: 'insert', v: B[prevY] });
                     } else {
@@ -1250,41 +1514,64 @@ class WebServer(BaseHTTPRequestHandler):
                     x--;
                     y--;
                 }
-                while (x > 0) {
-                    ops.push({ t: 'delete', v: A[x - 1] });
-                    x--;
-                }
-                while (y > 0) {
-                    ops.push({ t: 'insert', v: B[y - 1] });
-                    y--;
-                }
 
-                ops.reverse();
-                const merged = [];
-                for (const op of ops) {
-                    const last = merged[merged.length - 1];
-                    if (last && last.t === op.t) {
-                        last.v += op.v;
-                    } else {
-                        merged.push({ t: op.t, v: op.v });
-                    }
+                return ops.reverse();
+            }
+
+            // Cleaning usually touches a small part of a field, so only diff what lies
+            // between the unchanged leading and trailing tokens
+            let head = 0;
+            while (head < aTokens.length && head < bTokens.length && aTokens[head] === bTokens[head]) {
+                head++;
+            }
+            let aEnd = aTokens.length;
+            let bEnd = bTokens.length;
+            while (aEnd > head && bEnd > head && aTokens[aEnd - 1] === bTokens[bEnd - 1]) {
+                aEnd--;
+                bEnd--;
+            }
+
+            // A pure insertion or deletion (e.g. an added span) needs no search at all
+            let middleOps;
+            if (head === aEnd) {
+                middleOps = [{ t: 'insert', v: bTokens.slice(head, bEnd).join('') }];
+            } else if (head === bEnd) {
+                middleOps = [{ t: 'delete', v: aTokens.slice(head, aEnd).join('') }];
+            } else {
+                middleOps = myersDiff(aTokens.slice(head, aEnd), bTokens.slice(head, bEnd));
+            }
+
+            const diffOps = [];
+            if (head > 0) {
+                diffOps.push({ t: 'equal', v: aTokens.slice(0, head).join('') });
+            }
+            for (const op of middleOps) {
+                const last = diffOps[diffOps.length - 1];
+                if (last && last.t === op.t) {
+                    last.v += op.v;
+                } else {
+                    diffOps.push(op);
                 }
-                return merged;
+            }
+            if (aEnd < aTokens.length) {
+                diffOps.push({ t: 'equal', v: aTokens.slice(aEnd).join('') });
             }
 
-            const diffOps = myersDiff(aTokens, bTokens);
-            const out = [];
+            const before = [];
+            const after = [];
             for (const op of diffOps) {
                 if (op.t === 'equal') {
-                    out.push(`<span class="diff-unchanged">${escapeHtml(op.v)}</span>`);
-                } else if (side === 'before' && op.t === 'delete') {
-                    out.push(`<span class="diff-removed">${escapeHtml(op.v)}</span>`);
-                } else if (side === 'after' && op.t === 'insert') {
-                    out.push(`<span class="diff-added">${escapeHtml(op.v)}</span>`);
+                    const unchanged = `<span class="diff-unchanged">${escapeHtml(op.v)}</span>`;
+                    before.push(unchanged);
+                    after.push(unchanged);
+                } else if (op.t === 'delete') {
+                    before.push(`<span class="diff-removed">${escapeHtml(op.v)}</span>`);
+                } else {
+                    after.push(`<span class="diff-added">${escapeHtml(op.v)}</span>`);
                 }
             }
 
-            return out.join('');
+            return { before: before.join(''), after: after.join('') };
         }
 
         async function checkStatus() {
@@ -1377,24 +1664,21 @@ class WebServer(BaseHTTPRequestHandler):
                         body: JSON.stringify({
                             deck_name: deckName,
                             batch_size: scanChunkSize,
-                            start_from: startFrom
+                            start_from: startFrom,
+                            stream: true
                         })
                     });
 
-                    const data = await response.json();
-
-                    if (data.error) {
-                        throw new Error(data.error);
-                    }
+                    // Cards arrive one per line as they are cleaned, followed by the batch summary
+                    const data = await readProcessStream(response, card => {
+                        combined.push(card);
+                        document.getElementById('processingText').textContent = `Scanning ${startFrom}/${totalCards === null ? '?' : totalCards} cards... Found ${combined.length} to review`;
+                    });
 
                     if (totalCards === null && typeof data.total_cards === 'number') {
                         totalCards = data.total_cards;
                     }
 
-                    if (Array.isArray(data.cards)) {
-                        combined = combined.concat(data.cards);
-                    }
-
                     totalSkipped += (data.skipped_count || 0);
 
                     startFrom = (typeof data.next_start_from === 'number')
@@ -1442,8 +1726,53 @@ class WebServer(BaseHTTPRequestHandler):
             }
         }
 
+        async function readProcessStream(response, onCard) {
+            if (!response.ok || !response.body) {
+                const data = await response.json();
+                throw new Error(data.error || `HTTP ${response.status}`);
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            let summary = null;
+
+            const handleLine = line => {
+                if (!line.trim()) {
+                    return;
+                }
+                const message = JSON.parse(line);
+                if (message.error) {
+                    throw new Error(message.error);
+                }
+                if (message.card) {
+                    onCard(message.card);
+                } else if (message.summary) {
+                    summary = message.summary;
+                }
+            };
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffered += decoder.decode(value, { stream: true });
+                const lines = buffered.split('\\n');
+                buffered = lines.pop();
+                lines.forEach(handleLine);
+            }
+            handleLine(buffered + decoder.decode());
+
+            if (!summary) {
+                throw new Error('Processing stopped before the batch finished');
+            }
+            return summary;
+        }
+
         function displayCards(data) {
             cardData = data.cards || [];
+            cardIndexById = new Map(cardData.map((card, index) => [card.card_id, index]));
             selectedCards.clear();
             skippedCount = data.skipped_count || 0;
             lastScanSeconds = data.scan_seconds || 0;
@@ -1467,14 +1796,60 @@ class WebServer(BaseHTTPRequestHandler):
             renderCards();
         }
 
+        // Only cards near the viewport are built; the rest are empty slots holding their
+        // last measured (or an estimated) height, so long review lists stay cheap to lay out
+        const CARD_ESTIMATED_HEIGHT = 700;
+        const cardHeights = new Map();
+        let cardObserver = null;
+
         function renderCards() {
             const container = document.getElementById('cardContainer');
+            if (cardObserver) {
+                cardObserver.disconnect();
+            }
             container.innerHTML = '';
-            
+            cardObserver = new IntersectionObserver(updateCardSlots, { rootMargin: '1500px 0px' });
+
+            const fragment = document.createDocumentFragment();
             cardData.forEach((card, index) => {
-                const cardEl = createCardElement(card, index);
-                container.appendChild(cardEl);
+                const slot = document.createElement('div');
+                slot.className = 'card-slot';
+                slot.dataset.index = String(index);
+                slot.style.height = `${cardHeights.get(card.card_id) || CARD_ESTIMATED_HEIGHT}px`;
+                fragment.appendChild(slot);
+                cardObserver.observe(slot);
+            });
+            container.appendChild(fragment);
+        }
+
+        function updateCardSlots(entries) {
+            const toBuild = [];
+            const toDrop = [];
+            for (const entry of entries) {
+                const slot = entry.target;
+                const index = Number(slot.dataset.index);
+                if (!cardData[index]) {
+                    continue;
+                }
+                if (entry.isIntersecting && !slot.firstChild) {
+                    toBuild.push([slot, index]);
+                } else if (!entry.isIntersecting && slot.firstChild) {
+                    toDrop.push([slot, index]);
+                }
+            }
+
+            // Measure every card being dropped before touching the DOM, so a fast scroll
+            // costs one layout instead of one per card
+            const heights = toDrop.map(([slot]) => slot.offsetHeight);
+            toDrop.forEach(([slot, index], i) => {
+                cardHeights.set(cardData[index].card_id, heights[i]);
+                slot.style.height = `${heights[i]}px`;
+                slot.replaceChildren();
             });
+            for (const [slot, index] of toBuild) {
+                slot.appendChild(createCardElement(cardData[index], index));
+                slot.style.height = '';
+            }
         }
 
         function createCardElement(card, index) {
@@ -1494,6 +1869,7 @@ class WebServer(BaseHTTPRequestHandler):
 
             const frontChanged = originalFront !== newFront;
             const backChanged = originalBack !== newBack;
+            const frontDiff = renderRawDiff(originalFront, newFront);
             
             cardDiv.innerHTML = `
                 <div class="card-header">
@@ -1515,14 +1891,14 @@ class WebServer(BaseHTTPRequestHandler):
                                 <div class="field-subtitle">Rendered</div>
                                 <div class="field-rendered">${originalFront}</div>
                                 <div class="field-subtitle">Raw HTML</div>
-                                <pre class="field-raw">${renderRawDiff(originalFront, newFront, 'before')}</pre>
+                                <pre class="field-raw">${frontDiff.before}</pre>
                             </div>
                             <div class="field-section">
                                 <h4>After</h4>
                                 <div class="field-subtitle">Rendered</div>
                                 <div class="field-rendered">${newFront}</div>
                                 <div class="field-subtitle">Raw HTML</div>
-                                <pre class="field-raw">${renderRawDiff(originalFront, newFront, 'after')}</pre>
+                                <pre class="field-raw">${frontDiff.after}</pre>
                             </div>
                         </div>
                     </div>
@@ -1534,7 +1910,7 @@ class WebServer(BaseHTTPRequestHandler):
                                 <div class="field-subtitle">Rendered</div>
                                 <div class="field-rendered">${originalBack}</div>
                                 <div class="field-subtitle">Raw HTML</div>
-                                <pre class="field-raw" id="diff-before-${card.card_id}">${renderRawDiff(originalBack, newBack, 'before')}</pre>
+                                <pre class="field-raw" id="diff-before-${card.card_id}"></pre>
                             </div>
                             <div class="field-section">
                                 <h4>After</h4>
@@ -1555,20 +1931,30 @@ class WebServer(BaseHTTPRequestHandler):
             const rawDiff = cardDiv.querySelector(`#diff-edit-${card.card_id}`);
             const rawBeforeDiff = cardDiv.querySelector(`#diff-before-${card.card_id}`);
             if (textarea && rendered) {
-                rendered.innerHTML = textarea.value || '';
-                if (rawDiff) {
-                    rawDiff.innerHTML = renderRawDiff(originalBack, textarea.value || '', 'after');
-                }
-                if (rawBeforeDiff) {
-                    rawBeforeDiff.innerHTML = renderRawDiff(originalBack, textarea.value || '', 'before');
+                // Edits live on the card, since its element is dropped once scrolled far away
+                if (typeof card.edited_back === 'string') {
+                    textarea.value = card.edited_back;
                 }
-                textarea.addEventListener('input', () => {
+                const updateBackPreview = () => {
                     rendered.innerHTML = textarea.value || '';
+                    const backDiff = renderRawDiff(originalBack, textarea.value || '');
                     if (rawDiff) {
-                        rawDiff.innerHTML = renderRawDiff(originalBack, textarea.value || '', 'after');
+                        rawDiff.innerHTML = backDiff.after;
                     }
                     if (rawBeforeDiff) {
-                        rawBeforeDiff.innerHTML = renderRawDiff(originalBack, textarea.value || '', 'before');
+                        rawBeforeDiff.innerHTML = backDiff.before;
+                    }
+                };
+                updateBackPreview();
+                // Fast typing fires several input events per frame; redraw the preview once
+                let previewFrame = 0;
+                textarea.addEventListener('input', () => {
+                    card.edited_back = textarea.value;
+                    if (!previewFrame) {
+                        previewFrame = requestAnimationFrame(() => {
+                            previewFrame = 0;
+                            updateBackPreview();
+                        });
                     }
                 });
             }
@@ -1583,31 +1969,31 @@ class WebServer(BaseHTTPRequestHandler):
                 selectedCards.add(cardId);
             }
             
-            const cardEl = document.getElementById(`card-${cardData.findIndex(c => c.card_id === cardId)}`);
-            const checkbox = cardEl.querySelector('.custom-checkbox');
-            
-            if (selectedCards.has(cardId)) {
-                cardEl.classList.add('selected');
-                checkbox.classList.add('checked');
-                checkbox.textContent = '✓';
-            } else {
-                cardEl.classList.remove('selected');
-                checkbox.classList.remove('checked');
-                checkbox.textContent = '';
+            const cardEl = document.getElementById(`card-${cardIndexById.get(cardId)}`);
+            // Cards that aren't built yet pick up the selection in createCardElement
+            if (cardEl) {
+                setCardElementSelected(cardEl, selectedCards.has(cardId));
             }
-            
             updateStats();
         }
 
+        function setCardElementSelected(cardEl, selected) {
+            const checkbox = cardEl.querySelector('.custom-checkbox');
+            cardEl.classList.toggle('selected', selected);
+            checkbox.classList.toggle('checked', selected);
+            checkbox.textContent = selected ? '✓' : '';
+        }
+
+        // Only the cards currently built need patching; the rest read selectedCards when created
         function selectAll() {
             cardData.forEach(card => selectedCards.add(card.card_id));
-            renderCards();
+            document.querySelectorAll('#cardContainer .card').forEach(el => setCardElementSelected(el, true));
             updateStats();
         }
 
         function selectNone() {
             selectedCards.clear();
-            renderCards();
+            document.querySelectorAll('#cardContainer .card').forEach(el => setCardElementSelected(el, false));
             updateStats();
         }
 
@@ -1630,16 +2016,15 @@ class WebServer(BaseHTTPRequestHandler):
             const updates = [];
             
             selectedCards.forEach(cardId => {
-                const card = cardData.find(c => c.card_id === cardId);
+                const card = cardData[cardIndexById.get(cardId)];
                 if (card) {
-                    const textarea = document.getElementById(`edit-${cardId}`);
                     updates.push({
                         card_id: cardId,
                         note_id: card.note_id,
                         front_field: card.front_field,
                         back_field: card.back_field,
                         front: card.new_front,
-                        back: textarea.value
+                        back: typeof card.edited_back === 'string' ? card.edited_back : card.new_back
                     });
                 }
             });
@@ -1679,13 +2064,100 @@ class WebServer(BaseHTTPRequestHandler):
 </html>"""
 
 
+_worker_card_cleaner = None
+
+
+def _clean_card_chunk(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str, bool]]:
+    """Clean a chunk of (front, back) pairs in a worker process"""
+    global _worker_card_cleaner
+    if _worker_card_cleaner is None:
+        _worker_card_cleaner = CardCleaner()
+    return [_worker_card_cleaner.clean_card(front, back) for front, back in pairs]
+
+
 class AnkiDeckCleaner:
     """Main application class for cleaning Anki decks"""
 
-    def __init__(self):
+    def __init__(self, use_cleaned_hashes: bool = True):
         self.anki = AnkiConnector()
         self.card_cleaner = CardCleaner()
         self._deck_card_ids_cache = {}
+        self.cleaned_hashes: Dict[str, str] = self._load_cleaned_hashes() if use_cleaned_hashes else {}
+        self._hashes_lock = threading.Lock()
+        self._clean_pool = None
+        self._clean_results: Dict[str, Tuple[str, str, bool]] = {}
+        self._prefetch_pool = None
+        self._prefetch_anki = None
+        self._card_info_prefetch = None
+
+    @staticmethod
+    def _load_cleaned_hashes() -> Dict[str, str]:
+        hashes = {}
+        try:
+            with open(CLEANED_HASHES_PATH, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        hashes.update(json.loads(line))
+                    except ValueError:
+                        # A run killed mid-write can leave a torn last line
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Ignoring unreadable hash file {CLEANED_HASHES_PATH}: {e}")
+        return hashes
+
+    def _append_cleaned_hashes(self, new_hashes: Dict[str, str]):
+        """Record notes whose current content needs no cleaning as one appended line"""
+        if not new_hashes:
+            return
+        with self._hashes_lock:
+            self.cleaned_hashes.update(new_hashes)
+            try:
+                with open(CLEANED_HASHES_PATH, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(new_hashes, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Failed to save {CLEANED_HASHES_PATH}: {e}")
+
+    def _prefetch_card_info(self, card_ids: List[int]):
+        """Start cardsInfo for the batch the web UI will most likely ask for next"""
+        if not card_ids:
+            return
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+            # Own session, so the prefetch never shares a connection with the request thread
+            self._prefetch_anki = AnkiConnector(self.anki.url)
+        future = self._prefetch_pool.submit(self._prefetch_anki.get_card_info, card_ids)
+        self._card_info_prefetch = (card_ids, time.monotonic(), future)
+
+    def _fetch_card_info(self, card_ids: List[int]) -> List[Dict]:
+        """cardsInfo for a batch, reusing a matching prefetch if it is still fresh"""
+        prefetch, self._card_info_prefetch = self._card_info_prefetch, None
+        if prefetch is not None:
+            prefetched_ids, started, future = prefetch
+            if prefetched_ids == card_ids and time.monotonic() - started <= CARD_INFO_PREFETCH_MAX_AGE:
+                try:
+                    return future.result()
+                except Exception:
+                    pass
+        return self.anki.get_card_info(card_ids)
+
+    def _iter_clean_many(self, pairs: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, bool]]:
+        """Clean (front, back) pairs in order, spreading large scans over worker processes"""
+        if len(pairs) < PARALLEL_CLEAN_MIN_CARDS:
+            for front, back in pairs:
+                yield self.card_cleaner.clean_card(front, back)
+            return
+
+        if self._clean_pool is None:
+            self._clean_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        chunks = [pairs[i:i + PARALLEL_CLEAN_CHUNK_SIZE] for i in range(0, len(pairs), PARALLEL_CLEAN_CHUNK_SIZE)]
+        for chunk_result in self._clean_pool.map(_clean_card_chunk, chunks):
+            yield from chunk_result
+
+    @staticmethod
+    def _content_hash(front: str, back: str) -> str:
+        return hashlib.blake2b((front + '\x1f' + back).encode('utf-8'), digest_size=16).hexdigest()
 
     def _select_front_back_field_names(self, fields_dict: Dict) -> Tuple[str, str]:
         if not isinstance(fields_dict, dict):
@@ -1716,6 +2188,18 @@ class AnkiDeckCleaner:
 
     def process_cards_for_review(self, deck_name: str, batch_size: int = 25, start_from: int = 0) -> Dict:
         """Process cards and return those that need changes"""
+        cards_to_review = []
+        summary = {}
+        for kind, item in self.iter_cards_for_review(deck_name, batch_size, start_from):
+            if kind == 'card':
+                cards_to_review.append(item)
+            else:
+                summary = item
+        return {"cards": cards_to_review, **summary}
+
+    def iter_cards_for_review(self, deck_name: str, batch_size: int = 25, start_from: int = 0) -> Iterator[Tuple[str, Dict]]:
+        """Yield ('card', card) for each card that needs changes as soon as it is cleaned,
+        then ('summary', counts) once the batch is done"""
         # Get all cards in deck
         card_ids = self._deck_card_ids_cache.get(deck_name)
         if start_from == 0 or card_ids is None:
@@ -1727,10 +2211,12 @@ class AnkiDeckCleaner:
         batch_card_ids = card_ids[start_from:end_idx]
         
         if not batch_card_ids:
-            return {"cards": [], "skipped_count": 0, "total_cards": len(card_ids)}
+            yield 'summary', {"skipped_count": 0, "total_cards": len(card_ids)}
+            return
         
-        # Get card info
-        cards_info = self.anki.get_card_info(batch_card_ids)
+        # Get card info, then start fetching the next batch while this one is cleaned
+        cards_info = self._fetch_card_info(batch_card_ids)
+        self._prefetch_card_info(card_ids[end_idx:end_idx + batch_size])
 
         card_entries = []
         note_ids_to_fetch = []
@@ -1755,8 +2241,9 @@ class AnkiDeckCleaner:
                 if nid is not None:
                     note_info_by_id[nid] = note_info
         
-        cards_to_review = []
         skipped_count = 0
+        clean_hashes = {}
+        to_clean = []
         
         def _extract_two_fields(fields_dict: Dict) -> Tuple[str, str, str, str]:
             front_name, back_name = self._select_front_back_field_names(fields_dict)
@@ -1792,16 +2279,38 @@ class AnkiDeckCleaner:
                 skipped_count += 1
                 continue
             
-            # Clean the card
-            new_front, new_back, changed = self.card_cleaner.clean_card(original_front, original_back)
-            
-            if changed:
+            # Unchanged since it was last found clean or had its changes applied
+            content_hash = self._content_hash(original_front, original_back)
+            if self.cleaned_hashes.get(str(note_id)) == content_hash:
+                continue
+
+            to_clean.append((card_info, note_id, front_field, back_field, original_front, original_back, content_hash))
+
+        # Clean the cards, reusing results for content already cleaned this session
+        cached_results = {
+            entry[-1]: self._clean_results[entry[-1]] for entry in to_clean if entry[-1] in self._clean_results
+        }
+        cleaned = self._iter_clean_many(
+            [(front, back) for *_, front, back, content_hash in to_clean if content_hash not in cached_results]
+        )
+
+        for card_info, note_id, front_field, back_field, original_front, original_back, content_hash in to_clean:
+            result = cached_results.get(content_hash)
+            if result is None:
+                result = next(cleaned)
+                if len(self._clean_results) >= CLEAN_RESULT_CACHE_SIZE:
+                    self._clean_results.clear()
+                self._clean_results[content_hash] = result
+            new_front, new_back, changed = result
+            if not changed:
+                clean_hashes[str(note_id)] = content_hash
+            else:
                 card_id = (
                     card_info.get('cardId')
                     or card_info.get('card_id')
                     or card_info.get('id')
                 )
-                cards_to_review.append({
+                yield 'card', {
                     'card_id': card_id,
                     'note_id': note_id,
                     'front_field': front_field,
@@ -1810,10 +2319,11 @@ class AnkiDeckCleaner:
                     'original_back': original_back,
                     'new_front': new_front,
                     'new_back': new_back
-                })
-        
-        return {
-            "cards": cards_to_review,
+                }
+
+        self._append_cleaned_hashes(clean_hashes)
+
+        yield 'summary', {
             "skipped_count": skipped_count,
             "total_cards": len(card_ids),
             "processed_count": len(batch_card_ids),
@@ -1827,21 +2337,38 @@ class AnkiDeckCleaner:
         updated_count = 0
 
         prepared = []
-        
+
+        def _note_id_of(update: Dict):
+            return update.get('note_id') or update.get('noteId') or update.get('nid') or update.get('note')
+
+        # Look up field names for every update that lacks them in one notesInfo call
+        missing_field_note_ids = [
+            _note_id_of(u)
+            for u in updates
+            if isinstance(u, dict)
+            and _note_id_of(u) is not None
+            and not ((u.get('front_field') or u.get('frontField')) and (u.get('back_field') or u.get('backField')))
+        ]
+        note_fields_by_id = {}
+        if missing_field_note_ids:
+            try:
+                note_ids = list(dict.fromkeys(missing_field_note_ids))
+                for note_id, note_info in zip(note_ids, self.anki.get_note_info(note_ids) or []):
+                    if isinstance(note_info, dict):
+                        note_fields_by_id[note_id] = note_info.get('fields', {})
+            except Exception as e:
+                print(f"Failed to fetch note info: {e}")
+
         for update in updates:
             try:
-                note_id = update.get('note_id') or update.get('noteId') or update.get('nid') or update.get('note')
+                note_id = _note_id_of(update)
                 if note_id is None:
                     raise KeyError('note_id')
 
                 front_field = update.get('front_field') or update.get('frontField')
                 back_field = update.get('back_field') or update.get('backField')
                 if not front_field or not back_field:
-                    note_infos = self.anki.get_note_info([note_id])
-                    if not note_infos:
-                        raise KeyError('front_field')
-
-                    fields = note_infos[0].get('fields', {})
+                    fields = note_fields_by_id.get(note_id)
                     if not (isinstance(fields, dict) and len(fields) >= 2):
                         raise KeyError('front_field')
 
@@ -1855,42 +2382,50 @@ class AnkiDeckCleaner:
                 }
                 
                 card_id = update.get('card_id') or update.get('cardId') or update.get('id')
-                prepared.append((card_id, note_id, fields))
+                prepared.append((card_id, note_id, fields, self._content_hash(update['front'], update['back'])))
                 
             except Exception as e:
                 card_id = update.get('card_id') or update.get('cardId') or update.get('id')
                 update_keys = list(update.keys()) if isinstance(update, dict) else []
                 print(f"Failed to update card {card_id}: {e} (keys={update_keys})")
 
-        chunk_size = 25
+        # Post-update content, so applied notes are skipped until edited again
+        applied_hashes = {}
+        chunk_size = 200
         for i in range(0, len(prepared), chunk_size):
             chunk = prepared[i:i + chunk_size]
-            actions = [
-                {
-                    "action": "updateNoteFields",
-                    "params": {"note": {"id": note_id, "fields": fields}},
-                }
-                for _, note_id, fields in chunk
-            ]
 
+            # Retry whatever failed one note at a time, or the whole chunk if
+            # the multi request itself did
+            failed = chunk
             try:
-                self.anki.multi(actions)
-                updated_count += len(chunk)
-            except Exception:
-                for card_id, note_id, fields in chunk:
-                    try:
-                        self.anki.update_note_fields(note_id, fields)
+                errors = self.anki.update_note_fields_many([(note_id, fields) for _, note_id, fields, _ in chunk])
+                failed = []
+                for item, error in zip(chunk, errors):
+                    if error:
+                        failed.append(item)
+                    else:
                         updated_count += 1
-                    except Exception as e:
-                        print(f"Failed to update card {card_id}: {e} (keys=[])")
-        
+                        applied_hashes[str(item[1])] = item[3]
+            except Exception:
+                pass
+            for card_id, note_id, fields, h in failed:
+                try:
+                    self.anki.update_note_fields(note_id, fields)
+                    updated_count += 1
+                    applied_hashes[str(note_id)] = h
+                except Exception as e:
+                    print(f"Failed to update card {card_id}: {e} (keys=[])")
+
+        self._append_cleaned_hashes(applied_hashes)
+
         return {"updated_count": updated_count, "total_updates": len(updates)}
 
     def run_server(self, port: int = 8766):
         """Run the web server"""
         WebServer.cleaner = self
         
-        server = HTTPServer(('localhost', port), WebServer)
+        server = ThreadingHTTPServer(('localhost', port), WebServer)
         
         print(f"Starting server on http://localhost:{port}")
         print("Press Ctrl+C to stop the server")
@@ -1903,6 +2438,10 @@ class AnkiDeckCleaner:
         except KeyboardInterrupt:
             print("\nShutting down server...")
             server.shutdown()
+            if self._clean_pool is not None:
+                self._clean_pool.shutdown(cancel_futures=True)
+            if self._prefetch_pool is not None:
+                self._prefetch_pool.shutdown(cancel_futures=True)
 
 
 def main():
@@ -1911,10 +2450,15 @@ def main():
     
     parser = argparse.ArgumentParser(description='Anki Deck Cleaner')
     parser.add_argument('--port', type=int, default=8766, help='Port for web server (default: 8766)')
+    parser.add_argument(
+        '--recheck',
+        action='store_true',
+        help=f'Re-clean notes even if unchanged since they were last checked (ignores {CLEANED_HASHES_PATH})',
+    )
     
     args = parser.parse_args()
     
-    cleaner = AnkiDeckCleaner()
+    cleaner = AnkiDeckCleaner(use_cleaned_hashes=not args.recheck)
     cleaner.run_server(args.port)
 
 
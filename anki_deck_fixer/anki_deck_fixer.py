@@ -7,7 +7,7 @@ It uses AnkiConnect to interact with Anki and Claude API for intelligent card pr
 
 Prerequisites:
 1. Install AnkiConnect add-on in Anki (code: 2055492159)
-2. Install required packages: pip install requests anthropic
+2. Install required packages: pip install requests anthropic (optional: orjson)
 3. Set your Claude API key as environment variable: ANTHROPIC_API_KEY
 4. Have Anki running with AnkiConnect enabled
 
@@ -21,29 +21,178 @@ Safety features:
 # [x] Always allow front field to be edited in web interface
 # [x] Don't add new cards until the user explicitly requests it
 
+import atexit
+import base64
+import gzip
 import json
+from collections import deque
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
+import logging
+import logging.handlers
 import os
+import queue
+import sys
 import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-import anthropic
+from typing import List, Dict, Any, Optional, Iterator, TextIO, Tuple
 import difflib
+import hashlib
 import re
 import argparse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import webbrowser
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 import traceback
 
+from http_helpers import CORS_HEADERS, send_response_with_body
+
+try:  # Optional C-accelerated JSON; the stdlib is used when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+
 MODEL_NAME = "claude-sonnet-4-5-20250929"
 
+# Deck lists are fetched on every web request; they rarely change within seconds
+DECK_NAMES_MAX_AGE = 10.0
+# /api/status polls only need to know Anki answered recently
+STATUS_MAX_AGE = 1.0
+# Smaller JSON responses are sent as-is; gzip framing would outweigh the savings
+GZIP_MIN_BYTES = 1024
+
+# Claude's reply is prefilled with the start of the expected JSON object
+RESPONSE_PREFILL = '{"processed_cards": ['
+
+# Persistent record of Forvo hits (already stored in Anki media) and misses.
+# Each lookup is appended as a JSON object per line.
+FORVO_CACHE_PATH = ".forvo_cache.json"
+
+# Content hashes of cards as last written by process_deck, keyed by card ID,
+# plus the matching note modification times keyed by "note:<note ID>".
+# Appended to once per batch as a JSON object per line; later lines win.
+PROCESSED_HASHES_PATH = ".anki_hashes.jsonl"
+
+# Fields that determine whether a card needs another pass through Claude
+HASHED_FIELDS = ("Front", "Back", "Audio")
+
+# Patterns used on every card when extracting the word for audio lookups
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_LEADING_ARTICLE_RE = re.compile(r"^(en|ett|den|det|att)\s+", re.IGNORECASE)
+_PARENTHESIZED_RE = re.compile(r"\([^)]*\)")
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w\-_\.]")
+_WHITESPACE_SPLIT_RE = re.compile(r"(\s+)")
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# {"error": message} as _json_dumps lays it out, keyed by indent
+_JSON_ERROR_WRAPPERS = {
+    False: (b'{"error":', b'}'),
+    True: (b'{\n  "error": ', b'\n}'),
+}
+
+
+log = logging.getLogger("anki_deck_fixer")
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+
+
+def _setup_logging():
+    """Write log output from a background thread so slow console writes
+    don't stall the batch loop"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(_log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    log.addHandler(logging.handlers.QueueHandler(_log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+def _flush_log():
+    """Wait until queued log output has been written, e.g. before prompting"""
+    _log_queue.join()
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing max_calls per period seconds"""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until another call is allowed within the window"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
 class AnkiConnector:
     """Handles communication with Anki through AnkiConnect"""
 
     def __init__(self, url="http://localhost:8765"):
         self.url = url
+        self._local = threading.local()
+        self._deck_names: Optional[List[str]] = None
+        self._deck_names_time = 0.0
+        self._deck_names_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """This thread's session
+
+        Sessions reuse keep-alive connections instead of opening a new TCP
+        connection per action. requests.Session isn't documented as
+        thread-safe, and batch workers, iter_card_info pages and web requests
+        all call AnkiConnect at once, so each thread gets its own.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"Content-Type": "application/json"})
+            session.mount(
+                "http://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.2))
+            )
+            self._local.session = session
+        return session
 
     def request(self, action: str, **params):
         """Send request to AnkiConnect"""
@@ -51,9 +200,11 @@ class AnkiConnector:
 
         try:
             # print(f"---action: {action}, params: {params}")
-            response: requests.Response = requests.post(self.url, json=payload)
+            response: requests.Response = self.session.post(
+                self.url, data=_json_dumps(payload)
+            )
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
             # print(f"-----result: {result}")
 
             if result.get("error"):
@@ -66,9 +217,15 @@ class AnkiConnector:
                 "Cannot connect to Anki. Make sure Anki is running with AnkiConnect add-on installed."
             )
 
-    def get_deck_names(self) -> Dict:
-        """Get all deck names"""
-        return self.request("deckNames")
+    def get_deck_names(self, max_age: float = DECK_NAMES_MAX_AGE) -> Dict:
+        """Get all deck names, reusing a lookup made in the last max_age seconds"""
+        # Concurrent web requests wait for one in-flight lookup rather than each sending their own
+        with self._deck_names_lock:
+            now = time.monotonic()
+            if self._deck_names is None or now - self._deck_names_time > max_age:
+                self._deck_names = self.request("deckNames")
+                self._deck_names_time = now
+            return self._deck_names
 
     def get_cards_in_deck(self, deck_name: str) -> Dict:
         """Get all card IDs in a deck"""
@@ -78,10 +235,55 @@ class AnkiConnector:
         """Get all card IDs in a deck"""
         return self.request("findCards", query=f'deck:"{deck_name}" {search}')
 
+    def find_cards_in_deck_for_searches(
+        self, deck_name: str, searches: List[str]
+    ) -> List[List[int]]:
+        """Run several searches within a deck in one multi round trip, returning
+        the card IDs for each search in order"""
+        if not searches:
+            return []
+        results = self.multi(
+            [
+                {"action": "findCards", "params": {"query": f'deck:"{deck_name}" {search}'}}
+                for search in searches
+            ]
+        )
+        for result in results:
+            error = self.multi_error(result)
+            if error:
+                raise Exception(f"AnkiConnect error: {error}")
+        return results
+
     def get_card_info(self, card_ids: List[int]) -> Dict:
         """Get card information"""
         return self.request("cardsInfo", cards=card_ids)
 
+    def iter_card_info(
+        self, card_ids: List[int], chunk_size: int = 500, max_in_flight: int = 4
+    ) -> Iterator[List[Dict]]:
+        """Yield card information one cardsInfo page at a time, in order
+
+        Up to max_in_flight pages are requested ahead so their round trips
+        overlap, while only that many pages are ever held in memory.
+        """
+        chunks = [card_ids[i : i + chunk_size] for i in range(0, len(card_ids), chunk_size)]
+        if len(chunks) <= 1:
+            yield from map(self.get_card_info, chunks)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(chunks))) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(self.get_card_info, chunk))
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def get_notes_mod_time(self, note_ids: List[int]) -> List[Dict]:
+        """Get the modification time of each note, much cheaper than notesInfo"""
+        return self.request("notesModTime", notes=note_ids)
+
     def get_note_tags(self, note_id: int) -> Dict:
         """Get note tags"""
         params = {"note": note_id}
@@ -108,6 +310,20 @@ class AnkiConnector:
         print("updateNote: ", params)
         return self.request("updateNote", **params)
 
+    def update_notes(self, updates: List[tuple]) -> List[Optional[str]]:
+        """Apply several (note_id, fields, tags) updates in one multi request,
+        returning each update's error, or None for those that were applied"""
+        results = self.multi(
+            [
+                {
+                    "action": "updateNote",
+                    "params": {"note": {"id": note_id, "fields": fields, "tags": tags}},
+                }
+                for note_id, fields, tags in updates
+            ]
+        )
+        return [self.multi_error(result) for result in results]
+
     def update_note_fields(
         self, note_id: int, fields: Dict[str, str], model_name: Optional[str] = None
     ) -> Dict:
@@ -152,16 +368,41 @@ class AnkiConnector:
         """Get note information"""
         return self.request("notesInfo", notes=note_ids)
 
-    def store_media_file(self, filename: str, data: bytes) -> bool:
-        """Store media file in Anki's media collection"""
-        try:
-            import base64
+    def multi(self, actions: List[Dict]) -> List:
+        """Send several actions in a single AnkiConnect round trip
 
-            encoded_data = base64.b64encode(data).decode("utf-8")
+        The request succeeds even when some of its actions fail; check each
+        result with multi_error.
+        """
+        return self.request("multi", actions=actions)
 
-            result = self.request(
-                "storeMediaFile", filename=filename, data=encoded_data
-            )
+    @staticmethod
+    def multi_error(result) -> Optional[str]:
+        """The error of one action's result from multi, or None if it succeeded
+
+        A failed action's result is {"result": None, "error": ...} in place of
+        its usual result.
+        """
+        if isinstance(result, dict) and result.get("error"):
+            return result["error"]
+        return None
+
+    def store_media_file(
+        self, filename: str, data: Optional[bytes] = None, url: Optional[str] = None
+    ) -> bool:
+        """Store media file in Anki's media collection
+
+        When a url is given Anki downloads the file itself, so the audio never
+        has to pass through this process as base64 text.
+        """
+        try:
+            if url:
+                result = self.request("storeMediaFile", filename=filename, url=url)
+            else:
+                encoded_data = base64.b64encode(data).decode("ascii")
+                result = self.request(
+                    "storeMediaFile", filename=filename, data=encoded_data
+                )
             return result is not None
         except Exception as e:
             print(f"Error storing media file {filename}: {e}")
@@ -171,39 +412,159 @@ class AnkiConnector:
 class ForvoAPI:
     """Handles Forvo API requests for Swedish pronunciation audio"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_path: str = FORVO_CACHE_PATH):
         self.api_key = api_key
         self.base_url = "https://apifree.forvo.com"
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+        # Lookups run concurrently, so smooth bursts to stay under Forvo's rate limit
+        self._limiter = RateLimiter(10, 1.0)
+        self.cache_path = cache_path
+        self._cache_lock = threading.Lock()
+        self._neg_cache: set = set()
+        self._hit_cache: Dict[str, str] = {}
+        # Starts the next appended line on its own if the file ends mid-line
+        self._append_prefix = b""
+        self._load_cache()
+
+    @staticmethod
+    def _cache_key(word: str, language: str) -> str:
+        return f"{language}:{word}"
 
-    def search_pronunciations(self, word: str, language: str = "sv") -> List[Dict]:
+    def _load_cache(self):
+        """Load previously recorded hits and misses from disk"""
+        try:
+            with open(self.cache_path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Ignoring unreadable Forvo cache {self.cache_path}: {e}")
+            return
+
+        # Caches written before lookups were appended are one indented object
+        try:
+            records = [_json_loads(content)]
+            legacy = b"\n" in content.strip()
+        except ValueError:
+            records = []
+            legacy = False
+            for line in content.splitlines():
+                try:
+                    records.append(_json_loads(line))
+                except ValueError:
+                    # A run killed mid-write can leave a torn last line
+                    continue
+
+        for record in records:
+            self._neg_cache.update(record.get("misses", []))
+            self._hit_cache.update(record.get("hits", {}))
+        if content and not content.endswith(b"\n"):
+            self._append_prefix = b"\n"
+
+        if legacy:
+            # Rewrite it as a single line so lines appended later can be read back
+            data = {"hits": self._hit_cache, "misses": sorted(self._neg_cache)}
+            tmp_path = f"{self.cache_path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(_json_dumps(data) + b"\n")
+                os.replace(tmp_path, self.cache_path)
+                self._append_prefix = b""
+            except OSError as e:
+                print(f"Failed to save Forvo cache {self.cache_path}: {e}")
+
+    def _append_cache(self, record: Dict[str, Any]):
+        """Record a lookup as one appended line, so the cost doesn't grow with
+        the size of the cache"""
+        try:
+            with open(self.cache_path, "ab") as f:
+                f.write(self._append_prefix + _json_dumps(record) + b"\n")
+            self._append_prefix = b""
+        except OSError as e:
+            print(f"Failed to save Forvo cache {self.cache_path}: {e}")
+
+    def record_miss(self, word: str, language: str = "sv"):
+        """Remember that Forvo has no pronunciation for a word"""
+        key = self._cache_key(word, language)
+        with self._cache_lock:
+            self._neg_cache.add(key)
+            self._append_cache({"misses": [key]})
+
+    def record_hit(self, word: str, filename: str, language: str = "sv"):
+        """Remember the media filename a word's pronunciation was stored as"""
+        key = self._cache_key(word, language)
+        with self._cache_lock:
+            self._hit_cache[key] = filename
+            self._append_cache({"hits": {key: filename}})
+
+    def _get(
+        self, url: str, timeout: float, max_attempts: int = 3, out: Optional[TextIO] = None
+    ) -> requests.Response:
+        """GET through the rate limiter, waiting out 429 responses"""
+        for attempt in range(1, max_attempts + 1):
+            with self._limiter:
+                response = self.session.get(url, timeout=timeout)
+            if response.status_code != 429 or attempt == max_attempts:
+                break
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            print(f"Forvo rate limit hit, retrying in {retry_after:.1f}s", file=out)
+            time.sleep(retry_after)
+
+        response.raise_for_status()
+        return response
+
+    def search_pronunciations(
+        self, word: str, language: str = "sv", out: Optional[TextIO] = None
+    ) -> List[Dict]:
         """Search for pronunciations of a word"""
         if not self.api_key:
             return []
 
+        if self._cache_key(word, language) in self._neg_cache:
+            return []
+
         url = f"{self.base_url}/key/{self.api_key}/format/json/action/word-pronunciations/word/{word}/language/{language}"
 
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            response = self._get(url, timeout=10, out=out)
             data = response.json()
 
             if data.get("attributes", {}).get("total", 0) == 0:
+                self.record_miss(word, language)
                 return []
 
             pronunciations = data.get("items", [])
+            if not pronunciations:
+                self.record_miss(word, language)
+                return []
+
             # Sort by votes (most voted first)
             pronunciations.sort(key=lambda x: x.get("votes", 0), reverse=True)
 
             return pronunciations[:3]  # Return top 3
 
         except Exception as e:
-            print(f"Forvo API error for '{word}': {e}")
+            print(f"Forvo API error for '{word}': {e}", file=out)
             return []
 
-    def download_pronunciation(self, word: str) -> Optional[Dict[str, Any]]:
-        """Download the best pronunciation for a word"""
-        pronunciations = self.search_pronunciations(word)
+    def download_pronunciation(
+        self, word: str, out: Optional[TextIO] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find the best pronunciation for a word
+
+        Returns the filename to store it under and the MP3 url, which Anki can
+        fetch directly. "cached" is set when a previous run already stored it.
+        """
+        cached_filename = self._hit_cache.get(self._cache_key(word, "sv"))
+        if cached_filename:
+            # Already stored in Anki's media collection by a previous run
+            return {"filename": cached_filename, "url": None, "word": word, "cached": True}
+
+        pronunciations = self.search_pronunciations(word, out=out)
 
         if not pronunciations:
             return None
@@ -214,28 +575,42 @@ class ForvoAPI:
         if not audio_url:
             return None
 
-        try:
-            # Download the audio file
-            response = self.session.get(audio_url, timeout=30)
-            response.raise_for_status()
-
-            # Generate filename
-            filename = f"{word}_forvo_{best.get('id', 'unknown')}.mp3"
-            # Clean filename for Anki
-            filename = re.sub(r"[^\w\-_\.]", "_", filename)
+        # Generate filename
+        filename = f"{word}_forvo_{best.get('id', 'unknown')}.mp3"
+        # Clean filename for Anki
+        filename = _UNSAFE_FILENAME_CHARS_RE.sub("_", filename)
 
-            return {
-                "filename": filename,
-                "data": response.content,
-                "word": word,
-                "votes": best.get("votes", 0),
-                "username": best.get("username", "unknown"),
-            }
+        return {
+            "filename": filename,
+            "url": audio_url,
+            "word": word,
+            "cached": False,
+            "votes": best.get("votes", 0),
+            "username": best.get("username", "unknown"),
+        }
 
+    def fetch_audio(self, url: str, out: Optional[TextIO] = None) -> Optional[bytes]:
+        """Download an MP3 ourselves, for when Anki can't fetch the url"""
+        try:
+            return self._get(url, timeout=30, out=out).content
         except Exception as e:
-            print(f"Error downloading audio for '{word}': {e}")
+            print(f"Error downloading audio from {url}: {e}", file=out)
             return None
 
+    def download_pronunciations(
+        self, words: List[str], max_workers: int = 5, out: Optional[TextIO] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Download the best pronunciation for several words concurrently"""
+        unique_words = list(dict.fromkeys(word for word in words if word))
+        if not unique_words:
+            return {}
+
+        # Forvo calls are I/O bound; a small pool overlaps the round trips
+        # while staying polite to the free API tier
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_words))) as pool:
+            results = pool.map(lambda word: self.download_pronunciation(word, out), unique_words)
+            return dict(zip(unique_words, results))
+
 
 class DiffFormatter:
     """Formats text differences with colors"""
@@ -246,6 +621,11 @@ class DiffFormatter:
         if old_text == new_text:
             return f"No changes: {old_text}"
 
+        # Anki fields are almost always a single line of HTML; a token diff is
+        # cheaper and more readable there than a line-based unified diff
+        if "\n" not in old_text and "\n" not in new_text:
+            return DiffFormatter._format_token_diff(old_text, new_text)
+
         # Use difflib to get differences
         differ = difflib.unified_diff(
             old_text.splitlines(keepends=True),
@@ -275,17 +655,52 @@ class DiffFormatter:
         return "\n".join(result) if result else f"Changed from: {old_text} → {new_text}"
 
     @staticmethod
-    def print_field_changes(field_name: str, old_value: str, new_value: str):
+    def _format_token_diff(old_text: str, new_text: str) -> str:
+        """Format an inline diff of whitespace-separated tokens"""
+        old_tokens = _WHITESPACE_SPLIT_RE.split(old_text)
+        new_tokens = _WHITESPACE_SPLIT_RE.split(new_text)
+        matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+
+        result = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                result.append("".join(old_tokens[i1:i2]))
+                continue
+            if tag in ("replace", "delete"):
+                # Removed text in red
+                result.append(f"\033[91m{''.join(old_tokens[i1:i2])}\033[0m")
+            if tag in ("replace", "insert"):
+                # Added text in green
+                result.append(f"\033[92m{''.join(new_tokens[j1:j2])}\033[0m")
+
+        return "".join(result)
+
+    @staticmethod
+    def print_field_changes(
+        field_name: str, old_value: str, new_value: str, out: Optional[TextIO] = None
+    ):
         """Print field changes with formatting"""
         if old_value != new_value:
-            print(f"\n  {field_name}:")
-            print(f"    {DiffFormatter.format_diff(old_value, new_value)}")
+            (out or sys.stdout).write(
+                f"\n  {field_name}:\n    {DiffFormatter.format_diff(old_value, new_value)}\n"
+            )
 
 
 class WebServer(BaseHTTPRequestHandler):
     """HTTP server to handle web interface requests"""
 
     fixer = None
+    # Keep connections open between the page's back-to-back API calls; every response
+    # sets Content-Length (or is chunked) so the browser knows where it ends
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # Requests are served on separate threads; POSTs that drive the fixer take this
+    # lock so a long batch never overlaps another, while GETs stay concurrent.
+    _work_lock = threading.Lock()
+    _interface_html_bytes: Optional[bytes] = None
+    _interface_html_gzip: Optional[bytes] = None
+    # Endpoint -> ((payload key, pretty), bytes) for responses that rarely change
+    _json_cache: Dict[str, Tuple[Tuple, bytes]] = {}
 
     def do_GET(self):
         """Handle GET requests"""
@@ -316,17 +731,18 @@ class WebServer(BaseHTTPRequestHandler):
 
         try:
             content_length = int(self.headers.get("Content-Length", 0))
-            post_data = self.rfile.read(content_length).decode("utf-8")
-            data = json.loads(post_data) if post_data else {}
-
-            if path == "/api/process":
-                self.handle_process_request(data)
-            elif path == "/api/apply":
-                self.handle_apply_request(data)
-            elif path == "/api/retry":
-                self.handle_retry_request(data)
-            else:
-                self.send_error(404)
+            post_data = self.rfile.read(content_length)
+            data = _json_loads(post_data) if post_data else {}
+
+            with self._work_lock:
+                if path == "/api/process":
+                    self.handle_process_request(data)
+                elif path == "/api/apply":
+                    self.handle_apply_request(data)
+                elif path == "/api/retry":
+                    self.handle_retry_request(data)
+                else:
+                    self.send_error(404)
         except Exception as e:
             print(f"Error handling POST {path}: {e}")
             traceback.print_exc()
@@ -337,15 +753,23 @@ class WebServer(BaseHTTPRequestHandler):
 
     def serve_interface(self):
         """Serve the main HTML interface"""
-        # Read the HTML content from the artifact or inline it
-        html_content = self.get_interface_html()
-
-        self.send_response(200)
-        self.send_header("Content-type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(html_content.encode("utf-8"))))
-        self.send_header("Cache-Control", "no-cache, no-store, must-revalidate")
-        self.end_headers()
-        self.wfile.write(html_content.encode("utf-8"))
+        # The page is static, so encode and compress it once for the server's lifetime
+        cls = type(self)
+        if cls._interface_html_bytes is None:
+            cls._interface_html_bytes = self.get_interface_html().encode("utf-8")
+            cls._interface_html_gzip = gzip.compress(cls._interface_html_bytes, 9)
+
+        use_gzip = self._accepts_gzip()
+        body = cls._interface_html_gzip if use_gzip else cls._interface_html_bytes
+
+        headers = [
+            ("Content-type", "text/html; charset=utf-8"),
+            ("Vary", "Accept-Encoding"),
+            ("Cache-Control", "no-cache, no-store, must-revalidate"),
+        ]
+        if use_gzip:
+            headers.append(("Content-Encoding", "gzip"))
+        send_response_with_body(self, 200, headers, body)
 
     def serve_decks(self):
         """Serve list of available decks"""
@@ -356,7 +780,7 @@ class WebServer(BaseHTTPRequestHandler):
 
             decks = self.fixer.anki.get_deck_names()
             response = {"decks": decks}
-            self.send_json_response(response)
+            self.send_json_response(response, cache_key=("decks", tuple(decks)))
         except Exception as e:
             print(f"Error getting decks: {e}")
             self.send_json_error(500, str(e))
@@ -373,14 +797,14 @@ class WebServer(BaseHTTPRequestHandler):
         # Test Anki connection
         try:
             if self.fixer:
-                self.fixer.anki.get_deck_names()
+                self.fixer.anki.get_deck_names(max_age=STATUS_MAX_AGE)
                 response["anki_connected"] = True
             else:
                 print("No fixer instance available")
         except Exception as e:
             print(f"Anki connection failed: {e}")
 
-        self.send_json_response(response)
+        self.send_json_response(response, cache_key=("status", *response.values()))
 
     def handle_process_request(self, data):
         """Handle card processing request"""
@@ -482,34 +906,57 @@ class WebServer(BaseHTTPRequestHandler):
             traceback.print_exc()
             self.send_json_error(500, str(e))
 
+    def _wants_pretty_json(self) -> bool:
+        """The web UI only parses responses; add ?pretty=1 to read them in a browser"""
+        return parse_qs(urlparse(self.path).query).get("pretty") == ["1"]
+
     def send_json_error(self, status_code: int, message: str):
         """Send a JSON error response"""
-        response_data = json.dumps({"error": message}, ensure_ascii=False, indent=2)
-        response_bytes = response_data.encode("utf-8")
-
-        self.send_response(status_code)
-        self.send_header("Content-type", "application/json; charset=utf-8")
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.send_header("Content-Length", str(len(response_bytes)))
-        self.end_headers()
-        self.wfile.write(response_bytes)
-
-    def send_json_response(self, data):
-        """Send JSON response"""
+        # Only the message varies, so serialize just the string into the fixed wrapper
+        prefix, suffix = _JSON_ERROR_WRAPPERS[self._wants_pretty_json()]
+        response_bytes = prefix + _json_dumps(message) + suffix
+
+        send_response_with_body(
+            self,
+            status_code,
+            [("Content-type", "application/json; charset=utf-8"), *CORS_HEADERS],
+            response_bytes,
+        )
+
+    def _accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def _cached_json_bytes(self, data, cache_key: Tuple) -> bytes:
+        """Serialize data once per distinct cache_key, whose first item names the endpoint"""
+        key = (cache_key, self._wants_pretty_json())
+        cached = self._json_cache.get(cache_key[0])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        response_bytes = _json_dumps(data, indent=key[1])
+        self._json_cache[cache_key[0]] = (key, response_bytes)
+        return response_bytes
+
+    def send_json_response(self, data, cache_key: Optional[Tuple] = None):
+        """Send JSON response, reusing the last serialization for an unchanged cache_key"""
         try:
-            response_data = json.dumps(data, ensure_ascii=False, indent=2)
-
-            self.send_response(200)
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-            self.send_header("Access-Control-Allow-Headers", "Content-Type")
-            response_bytes = response_data.encode("utf-8")
-            self.send_header("Content-Length", str(len(response_bytes)))
-            self.end_headers()
-            self.wfile.write(response_bytes)
+            if cache_key is None:
+                response_bytes = _json_dumps(data, indent=self._wants_pretty_json())
+            else:
+                response_bytes = self._cached_json_bytes(data, cache_key)
+
+            # Card payloads are mostly repetitive HTML; level 1 compresses them well at little CPU cost
+            use_gzip = len(response_bytes) >= GZIP_MIN_BYTES and self._accepts_gzip()
+            if use_gzip:
+                response_bytes = gzip.compress(response_bytes, 1)
+
+            headers = [
+                ("Content-type", "application/json; charset=utf-8"),
+                ("Vary", "Accept-Encoding"),
+                *CORS_HEADERS,
+            ]
+            if use_gzip:
+                headers.append(("Content-Encoding", "gzip"))
+            send_response_with_body(self, 200, headers, response_bytes)
 
         except Exception as e:
             print(f"Error serializing JSON response: {e}")
@@ -521,19 +968,16 @@ class WebServer(BaseHTTPRequestHandler):
             error_response = json.dumps(
                 {"error": f"JSON serialization failed: {str(e)}"}
             )
-            self.send_response(500)
-            self.send_header("Content-type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(error_response)))
-            self.end_headers()
-            self.wfile.write(error_response.encode("utf-8"))
+            send_response_with_body(
+                self,
+                500,
+                [("Content-type", "application/json; charset=utf-8")],
+                error_response.encode("utf-8"),
+            )
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+        send_response_with_body(self, 200, CORS_HEADERS, b"")
 
     def log_message(self, format, *args):
         """Override to reduce log noise"""
@@ -1531,7 +1975,7 @@ def start_web_server(fixer, port: int = 8080):
     """Start the web server"""
     WebServer.fixer = fixer
 
-    server = HTTPServer(("localhost", port), WebServer)
+    server = ThreadingHTTPServer(("localhost", port), WebServer)
 
     print(f"🚀 Starting web server on http://localhost:{port}")
     print("🌐 Opening browser...")
@@ -1630,6 +2074,56 @@ Environment Variables:
     return parser.parse_args()
 
 
+class ProcessedCardStream:
+    """Incrementally extracts completed objects from the "processed_cards"
+    array of a JSON response as it is streamed in"""
+
+    _ARRAY_START_RE = re.compile(r'"processed_cards"\s*:\s*\[')
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self._done = False
+        self._decoder = json.JSONDecoder()
+        self.cards: List[Dict] = []
+
+    def feed(self, text: str) -> List[Dict]:
+        """Add streamed text and return any card objects completed by it"""
+        self._buffer += text
+        if self._done:
+            return []
+
+        if self._pos is None:
+            m = self._ARRAY_START_RE.search(self._buffer)
+            if not m:
+                return []
+            self._pos = m.end()
+
+        new_cards = []
+        buffer = self._buffer
+        while True:
+            i = self._pos
+            while i < len(buffer) and buffer[i] in " \t\r\n,":
+                i += 1
+            self._pos = i
+            if i >= len(buffer):
+                break
+            if buffer[i] == "]":
+                self._done = True
+                break
+            try:
+                card, end = self._decoder.raw_decode(buffer, i)
+            except json.JSONDecodeError:
+                # Object not closed yet; wait for more text
+                break
+            self._pos = end
+            if isinstance(card, dict):
+                new_cards.append(card)
+
+        self.cards.extend(new_cards)
+        return new_cards
+
+
 class SwedishCardProcessor:
     """Processes Swedish flashcards using Claude API"""
 
@@ -1639,84 +2133,167 @@ class SwedishCardProcessor:
         forvo_api_key: Optional[str] = None,
         anki_connector: Optional[AnkiConnector] = None,
     ):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self._api_key = api_key
+        self._client = None
+        self._client_lock = threading.Lock()
+        # Batches are sent concurrently; keep the request rate within API limits
+        self._claude_limiter = RateLimiter(50, 60.0)
+        self._system_prompt: Optional[str] = None
         self.forvo = ForvoAPI(forvo_api_key)
         self.anki = anki_connector
 
-    def process_card_batch(self, cards: List[Dict], additional_info: str = "") -> tuple[List[Dict], str]:
-        """Process a batch of cards using Claude"""
+    @property
+    def client(self):
+        """The Anthropic client, created on first use. Importing the SDK is
+        most of the script's startup time, so it is deferred until needed."""
+        with self._client_lock:
+            if self._client is None:
+                import anthropic
+
+                # The client retries 429s and overloaded errors itself, waiting
+                # as long as the retry-after header asks
+                self._client = anthropic.Anthropic(api_key=self._api_key, max_retries=5)
+            return self._client
+
+    def process_card_batch(
+        self,
+        cards: List[Dict],
+        additional_info: str = "",
+        out: Optional[TextIO] = None,
+    ) -> tuple[List[Dict], str]:
+        """Process a batch of cards using Claude
+
+        Progress messages are written to out, stdout by default.
+        """
+
+        if not cards:
+            print("No cards to process", file=out)
+            return [], ""
 
         # Prepare card data for Claude
         card_data = []
         for card in cards:
             note = card.get("note", {})
-            fields = note.get("fields", {})
+
+            # Only send non-empty field values with their whitespace collapsed;
+            # every input token adds latency and cost to the call
+            fields = {}
+            for name, field in note.get("fields", {}).items():
+                value = _WHITESPACE_RUN_RE.sub(" ", field.get("value", "")).strip()
+                if value:
+                    fields[name] = value
 
             card_info = {
                 "note_id": note.get("noteId"),
                 "model_name": note.get("modelName"),
                 "fields": fields,
-                "tags": note.get("tags", []),
             }
+            if note.get("tags"):
+                card_info["tags"] = note["tags"]
             card_data.append(card_info)
 
-        if len(cards) == 0:
-            print("No cards to process")
-            return [], ""
-
         # Create prompt for Claude
         prompt = self._create_processing_prompt(card_data, additional_info)
         print(
-            f"Prompt created, system: {len(prompt[0])} chars, user: {len(prompt[1])} chars for {len(cards)} cards"
+            f"Prompt created, system: {len(prompt[0])} chars, user: {len(prompt[1])} chars for {len(cards)} cards",
+            file=out,
         )
 
         try:
-            print("Calling Claude API...")
+            print("Calling Claude API...", file=out)
             system_prompt, user_prompt = prompt
-            response = self.client.messages.create(
+            card_stream = ProcessedCardStream()
+            card_stream.feed(RESPONSE_PREFILL)
+            self._claude_limiter.acquire()
+            with self.client.messages.stream(
                 model=MODEL_NAME,
                 max_tokens=4000,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
-            )
-
-            # Store raw response for debugging
-            raw_claude_response = response.content[0].text
+                # The rules are identical for every batch, so let Anthropic cache them
+                system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+                messages=[
+                    {"role": "user", "content": user_prompt},
+                    # Start the answer inside the JSON so it can't open with prose
+                    {"role": "assistant", "content": RESPONSE_PREFILL},
+                ],
+            ) as stream:
+                # Collect cards as their objects close, so a reply cut off by
+                # max_tokens still yields the cards it finished
+                for text in stream.text_stream:
+                    card_stream.feed(text)
+
+                # Store raw response for debugging
+                raw_claude_response = RESPONSE_PREFILL + stream.get_final_text()
 
             # Process cards and potentially add audio
-            processed_cards = self._parse_claude_response(raw_claude_response)
-            print(f"Parsed {len(processed_cards)} cards from Claude response")
+            processed_cards = self._parse_claude_response(raw_claude_response, out)
+            if not processed_cards and card_stream.cards:
+                # The response was cut off or malformed after some cards had
+                # already closed; keep those rather than losing the whole batch
+                print(
+                    f"Recovered {len(card_stream.cards)} complete cards from a partial Claude response",
+                    file=out,
+                )
+                processed_cards = card_stream.cards
+            print(f"Parsed {len(processed_cards)} cards from Claude response", file=out)
 
             # Add Forvo audio where appropriate
-            for card in processed_cards:
-                self._add_forvo_audio(card)
+            self._add_forvo_audio(processed_cards, out)
 
             return processed_cards, raw_claude_response
 
         except Exception as e:
-            print(f"Error processing batch with Claude: {e}")
-            traceback.print_exc()
+            print(f"Error processing batch with Claude: {e}", file=out)
+            traceback.print_exc(file=out)
             return [], ""
 
+    def process_cards_concurrently(
+        self,
+        cards: List[Dict],
+        additional_info: str = "",
+        chunk_size: int = 10,
+        max_workers: int = 4,
+    ) -> tuple[List[Dict], str]:
+        """Split cards into smaller Claude requests and run them side by side
+
+        Output tokens are generated sequentially, so one large request takes
+        roughly as long as all of its chunks would back to back.
+        """
+        chunks = [cards[i : i + chunk_size] for i in range(0, len(cards), chunk_size)]
+        if len(chunks) <= 1:
+            return self.process_card_batch(cards, additional_info)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            results = list(
+                pool.map(lambda chunk: self.process_card_batch(chunk, additional_info), chunks)
+            )
+
+        processed_cards = [card for chunk_cards, _ in results for card in chunk_cards]
+        raw_response = "\n".join(raw for _, raw in results if raw)
+        return processed_cards, raw_response
+
     def _create_processing_prompt(self, card_data: List[Dict], additional_info: str = "") -> tuple:
         """Create the system and user prompts for Claude to process cards.
         Returns a tuple of (system_prompt, user_prompt)."""
 
-        if os.path.exists("prompt.md"):
-            system_prompt = open("prompt.md", "r", encoding="utf-8").read()
-        else:
-            system_prompt = open("anki_deck_fixer/prompt.md", "r", encoding="utf-8").read()
+        if self._system_prompt is None:
+            if os.path.exists("prompt.md"):
+                self._system_prompt = open("prompt.md", "r", encoding="utf-8").read()
+            else:
+                self._system_prompt = open("anki_deck_fixer/prompt.md", "r", encoding="utf-8").read()
+        system_prompt = self._system_prompt
 
         user_prompt = f"""Process the following cards and return only the results strictly in the JSON format specified in your instructions, with no further comments.
 Cards to process:
-{json.dumps(card_data, indent=2, ensure_ascii=False)}
+{_json_dumps(card_data).decode("utf-8")}
 """
         if additional_info:
             user_prompt += f"\nAdditional instructions from the user:\n{additional_info}\n"
 
         return (system_prompt, user_prompt)
 
-    def _parse_claude_response(self, response_text: str) -> List[Dict]:
+    def _parse_claude_response(
+        self, response_text: str, out: Optional[TextIO] = None
+    ) -> List[Dict]:
         """Parse Claude's JSON response and prepare updates"""
         try:
             # Extract JSON from response (Claude might wrap it in text)
@@ -1724,67 +2301,90 @@ Cards to process:
             end_idx = response_text.rfind("}") + 1
 
             if start_idx == -1 or end_idx == 0:
-                print("No JSON found in Claude's response")
+                print("No JSON found in Claude's response", file=out)
                 return []
 
             json_str = response_text[start_idx:end_idx]
-            parsed_response = json.loads(json_str)
+            parsed_response = _json_loads(json_str)
 
             processed_cards = parsed_response.get("processed_cards", [])
 
             return processed_cards
 
         except json.JSONDecodeError as e:
-            print(f"Error parsing Claude's response as JSON: {e}")
-            print("Raw response:", response_text[:500])
+            print(f"Error parsing Claude's response as JSON: {e}", file=out)
+            print("Raw response:", response_text[:500], file=out)
             return []
         except Exception as e:
-            print(f"Error processing Claude's response: {e}")
+            print(f"Error processing Claude's response: {e}", file=out)
             return []
 
-    def _add_forvo_audio(self, card: Dict):
-        """Add Forvo audio to a card if appropriate"""
+    def _add_forvo_audio(self, cards: List[Dict], out: Optional[TextIO] = None):
+        """Add Forvo audio to the cards in a batch where appropriate"""
         if not self.forvo.api_key or not self.anki:
             return
 
-        updated_fields = card.get("updated_fields", {})
-        front_field = updated_fields.get("Front", "")
+        # Extract the main word from each front field (remove articles, parentheses, etc.)
+        words_by_card = []
+        for card in cards:
+            updated_fields = card.get("updated_fields", {})
+            word = self._extract_main_word(updated_fields.get("Front", ""))
+            if word and not updated_fields.get("Audio"):
+                words_by_card.append((card, word))
 
-        # Extract the main word from the front field (remove articles, parentheses, etc.)
-        word = self._extract_main_word(front_field)
+        if not words_by_card:
+            return
 
-        if word and not updated_fields.get("Audio"):
-            print(f"  Downloading audio for '{word}'...")
+        print(f"  Looking up audio for {len(words_by_card)} words...", file=out)
+        audio_by_word = self.forvo.download_pronunciations(
+            [word for _, word in words_by_card], out=out
+        )
 
-            audio_data = self.forvo.download_pronunciation(word)
+        for card, word in words_by_card:
+            audio_data = audio_by_word.get(word)
             if audio_data:
-                # Store the audio file in Anki's media collection
-                if self.anki.store_media_file(
-                    audio_data["filename"], audio_data["data"]
-                ):
+                # Store the audio file in Anki's media collection unless a
+                # previous run already did
+                stored = audio_data["cached"]
+                if not stored:
+                    stored = self._store_forvo_audio(audio_data, out)
+                    if stored:
+                        self.forvo.record_hit(word, audio_data["filename"])
+
+                if stored:
                     # Create audio tag for Anki
+                    updated_fields = card.get("updated_fields", {})
                     audio_tag = f"[sound:{audio_data['filename']}]"
                     updated_fields["Audio"] = audio_tag
                     card["updated_fields"] = updated_fields
 
-                    print(f"  ✓ Audio added: {audio_data['filename']}")
+                    print(f"  ✓ Audio added: {audio_data['filename']}", file=out)
                 else:
-                    print(f"  ✗ Failed to store audio file for '{word}'")
+                    print(f"  ✗ Failed to store audio file for '{word}'", file=out)
             else:
-                print(f"  - No audio found for '{word}'")
+                print(f"  - No audio found for '{word}'", file=out)
+
+    def _store_forvo_audio(self, audio_data: Dict[str, Any], out: Optional[TextIO] = None) -> bool:
+        """Have Anki pull the MP3 from Forvo, uploading it ourselves as a fallback"""
+        filename = audio_data["filename"]
+        if self.anki.store_media_file(filename, url=audio_data["url"]):
+            return True
+
+        data = self.forvo.fetch_audio(audio_data["url"], out)
+        return data is not None and self.anki.store_media_file(filename, data=data)
 
-    def _extract_main_word(self, front_field: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_main_word(front_field: str) -> str:
         """Extract the main Swedish word from the front field"""
         # Remove HTML tags
-        clean_text = re.sub(r"<[^>]+>", "", front_field)
+        clean_text = _HTML_TAG_RE.sub("", front_field)
 
         # Remove articles
-        clean_text = re.sub(
-            r"^(en|ett|den|det|att)\s+", "", clean_text, flags=re.IGNORECASE
-        )
+        clean_text = _LEADING_ARTICLE_RE.sub("", clean_text)
 
         # Remove parentheses and their contents
-        clean_text = re.sub(r"\([^)]*\)", "", clean_text)
+        clean_text = _PARENTHESIZED_RE.sub("", clean_text)
 
         # Take the first word
         words = clean_text.strip().split()
@@ -1804,6 +2404,91 @@ class AnkiDeckFixer:
         self.processor = SwedishCardProcessor(claude_api_key, forvo_api_key, self.anki)
         self.backup_created = False
         self.should_create_backup = should_create_backup
+        self.processed_hashes: Dict[str, Any] = self._load_processed_hashes()
+        self._hashes_lock = threading.Lock()
+        self._claims_lock = threading.Lock()
+
+    @staticmethod
+    def _load_processed_hashes() -> Dict[str, Any]:
+        hashes = {}
+        try:
+            with open(PROCESSED_HASHES_PATH, "rb") as f:
+                for line in f:
+                    try:
+                        hashes.update(_json_loads(line))
+                    except ValueError:
+                        # A run killed mid-write can leave a torn last line
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Ignoring unreadable hash file {PROCESSED_HASHES_PATH}: {e}")
+        return hashes
+
+    def _append_processed_hashes(self, new_hashes: Dict[str, Any]):
+        """Record a batch's hashes as one appended line, so the cost doesn't
+        grow with the size of the file and earlier batches survive a crash"""
+        # Called from the batch worker threads as well as the main thread
+        with self._hashes_lock:
+            self.processed_hashes.update(new_hashes)
+            try:
+                with open(PROCESSED_HASHES_PATH, "ab") as f:
+                    f.write(_json_dumps(new_hashes) + b"\n")
+            except OSError as e:
+                print(f"Failed to save {PROCESSED_HASHES_PATH}: {e}")
+
+    @staticmethod
+    def _content_hash(field_values: Dict[str, str], model_name: Optional[str]) -> str:
+        content = {name: field_values.get(name, "") for name in HASHED_FIELDS}
+        content["modelName"] = model_name
+        return hashlib.blake2b(
+            json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+
+    @staticmethod
+    def _field_values(note: Dict) -> Dict[str, str]:
+        return {
+            name: meta.get("value", "") if isinstance(meta, dict) else str(meta)
+            for name, meta in note.get("fields", {}).items()
+        }
+
+    @staticmethod
+    def _newlines_to_br(fields: Dict[str, str]) -> Dict[str, str]:
+        """Convert newlines in edited field values to Anki's <br>, in place"""
+        for field_name, value in fields.items():
+            if "\n" in value:
+                fields[field_name] = value.replace("\n", "<br>")
+        return fields
+
+    @staticmethod
+    def _build_update(
+        original_fields: Optional[Dict[str, str]], updated_fields: Dict[str, str]
+    ) -> tuple[str, Dict[str, str]]:
+        """Walk a card's suggested fields once, returning the formatted diff
+        against the original and the fields to send to Anki. Fields Claude
+        left unchanged are not sent."""
+        diff = io.StringIO()
+        update_fields = {}
+        for field_name, new_value in updated_fields.items():
+            if original_fields is not None:
+                old_value = original_fields.get(field_name, "")
+                if old_value == new_value:
+                    continue
+                DiffFormatter.print_field_changes(
+                    field_name, old_value, new_value, out=diff
+                )
+            update_fields[field_name] = (
+                new_value.replace("\n", "<br>") if "\n" in new_value else new_value
+            )
+        return diff.getvalue(), update_fields
+
+    def _is_unchanged_since_processed(self, card: Dict) -> bool:
+        note = card.get("note", {})
+        last_hash = self.processed_hashes.get(str(card.get("cardId")))
+        return last_hash is not None and last_hash == self._content_hash(
+            self._field_values(note), note.get("modelName")
+        )
 
     def create_backup(self, deck_name: str) -> Optional[str]:
         """Create backup of the deck if enabled"""
@@ -1827,127 +2512,296 @@ class AnkiDeckFixer:
             print(f"✗ Failed to create backup: {e}")
             raise
 
-    def process_deck(self, card_ids: List[int], batch_size: int):
-        """Process the entire deck in batches"""
-
-        # Process in batches
-        processed_count = 0
-        for i in range(0, len(card_ids), batch_size):
-            batch_card_ids = card_ids[i : i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (len(card_ids) + batch_size - 1) // batch_size
+    def _prepare_batch(
+        self, batch_card_ids: List[int], claimed_note_ids: Optional[set] = None
+    ) -> tuple[List[Dict], List[Dict], str]:
+        """Fetch card and note info for a batch and run it through Claude
+
+        Batches are prepared ahead of review, so a note whose cards span two
+        batches would be read by the later one before the earlier one's edit is
+        applied, and writing that stale copy back would undo the edit. Notes
+        already in claimed_note_ids are left to the batch that claimed them.
+
+        This runs while another batch is being reviewed, so its messages are
+        returned for printing with the batch instead of written as they happen.
+        """
+        output = io.StringIO()
+        cards_info = self.anki.get_card_info(batch_card_ids)
+
+        # Get unique note IDs, and the info of those edited since they were
+        # last processed; the rest are skipped without fetching their fields
+        note_ids = list(set([card["note"] for card in cards_info]))
+        if claimed_note_ids is not None:
+            with self._claims_lock:
+                note_ids = [note_id for note_id in note_ids if note_id not in claimed_note_ids]
+                claimed_note_ids.update(note_ids)
+            own_note_ids = set(note_ids)
+            own_cards_info = [card for card in cards_info if card["note"] in own_note_ids]
+            claimed_elsewhere = len(cards_info) - len(own_cards_info)
+            cards_info = own_cards_info
+            if claimed_elsewhere:
+                print(f"Skipping {claimed_elsewhere} cards whose note is handled by another batch", file=output)
+        note_mods = self._get_note_mods(note_ids)
+        stale_note_ids = {
+            note_id
+            for note_id in note_ids
+            if note_id not in note_mods
+            or self.processed_hashes.get(self._note_mod_key(note_id)) != note_mods[note_id]
+        }
+        notes_info = self.anki.get_note_info(list(stale_note_ids)) if stale_note_ids else []
+        notes_by_id = {n.get("noteId"): n for n in notes_info}
 
-            print(
-                f"\n--- Processing batch {batch_num}/{total_batches} ({len(batch_card_ids)} cards) ---"
-            )
+        # Combine card and note info
+        enriched_cards = []
+        for card in cards_info:
+            if card["note"] not in stale_note_ids:
+                continue
+            card["note"] = notes_by_id.get(card["note"], {})
+            if self._is_unchanged_since_processed(card):
+                continue
+            enriched_cards.append(card)
 
-            # Get card info
-            try:
-                cards_info = self.anki.get_card_info(batch_card_ids)
-
-                # Get unique note IDs and their info
-                note_ids = list(set([card["note"] for card in cards_info]))
-                notes_info = self.anki.get_note_info(note_ids)
-
-                # Combine card and note info
-                enriched_cards = []
-                for card in cards_info:
-                    note_id = card["note"]
-                    note_info = next(
-                        (n for n in notes_info if n["noteId"] == note_id), {}
-                    )
-                    card["note"] = note_info
-                    enriched_cards.append(card)
+        skipped = len(cards_info) - len(enriched_cards)
+        if skipped:
+            print(f"Skipping {skipped} cards unchanged since they were last processed", file=output)
 
-                # Process with Claude
-                processed_cards, full_log = self.processor.process_card_batch(
-                    enriched_cards
+        # Process with Claude
+        processed_cards, raw_response = self.processor.process_card_batch(enriched_cards, out=output)
+
+        # Claude omits cards that already follow every rule. Remember those as
+        # clean so later runs don't send them again until they are edited.
+        if self._is_complete_response(raw_response):
+            returned_note_ids = {card.get("note_id") for card in processed_cards}
+            clean_hashes = {}
+            for card in enriched_cards:
+                note = card["note"]
+                note_id = note.get("noteId")
+                if note_id in returned_note_ids:
+                    continue
+                clean_hashes[str(card["cardId"])] = self._content_hash(
+                    self._field_values(note), note.get("modelName")
                 )
+                if note_id in note_mods:
+                    clean_hashes[self._note_mod_key(note_id)] = note_mods[note_id]
+            if clean_hashes:
+                self._append_processed_hashes(clean_hashes)
+
+        return enriched_cards, processed_cards, output.getvalue()
+
+    def _apply_updates(self, pending: List[tuple]) -> List[int]:
+        """Apply (note_id, fields) updates, adding the reviewed tag, and return
+        the IDs of the notes that were updated
+
+        All tags are fetched in one round trip and every update is sent in a
+        single multi action. Notes whose update failed are retried one request
+        at a time so each failure can be logged.
+        """
+        prev_tags = self.anki.multi(
+            [
+                {"action": "getNoteTags", "params": {"note": note_id}}
+                for note_id, _ in pending
+            ]
+        )
+        updates = []
+        for (note_id, updated_fields), tags in zip(pending, prev_tags):
+            error = AnkiConnector.multi_error(tags)
+            if error:
+                log.error(f"✗ Failed to update note {note_id}: {error}")
+                continue
+            updates.append((note_id, updated_fields, (tags or []) + ["reviewed"]))
+        if not updates:
+            return []
+        log.info(f"\nApplying changes to {len(updates)} notes...")
 
-                if not processed_cards:
-                    print("No changes suggested by Claude for this batch")
-                    continue
+        applied_note_ids = []
+        failed = updates
+        try:
+            errors = self.anki.update_notes(updates)
+            applied_note_ids = [update[0] for update, error in zip(updates, errors) if not error]
+            failed = [update for update, error in zip(updates, errors) if error]
+        except Exception:
+            pass
 
-                # Review changes before applying
-                print(f"\nClaude suggests {len(processed_cards)} changes:")
-                for card in processed_cards:
-                    # Get the original card info to show the front field
-                    original_card = next(
-                        (
-                            c
-                            for c in enriched_cards
-                            if c["note"]["noteId"] == card["note_id"]
-                        ),
-                        None,
-                    )
-                    if original_card:
-                        front_field = original_card["note"]["fields"].get(
-                            "Front", "Unknown"
-                        )
-                        print(f"\n--- Card: {front_field} ---")
+        for note_id, fields, tags in failed:
+            try:
+                self.anki.update_note(note_id, fields, tags)
+                applied_note_ids.append(note_id)
+            except Exception as e:
+                log.error(f"✗ Failed to update note {note_id}: {e}")
+        return applied_note_ids
+
+    def _get_note_mods(self, note_ids: List[int]) -> Dict[int, int]:
+        """Map note IDs to modification times, or nothing if AnkiConnect is too
+        old to support notesModTime"""
+        if not note_ids:
+            return {}
+        try:
+            return {n["noteId"]: n["mod"] for n in self.anki.get_notes_mod_time(note_ids)}
+        except Exception:
+            return {}
 
-                        # Show field changes with diff formatting
-                        updated_fields = card.get("updated_fields", {})
-                        original_fields = original_card["note"]["fields"]
+    @staticmethod
+    def _note_mod_key(note_id: int) -> str:
+        return f"note:{note_id}"
 
-                        for field_name, new_value in updated_fields.items():
-                            old_value = original_fields.get(field_name, {}).get(
-                                "value", ""
-                            )
-                            if old_value != new_value:
-                                DiffFormatter.print_field_changes(
-                                    field_name, old_value, new_value
-                                )
-
-                # Ask for confirmation
-                response = input(
-                    f"\nApply these changes to batch {batch_num}? (y/n/s=skip/q=quit): "
-                ).lower()
-
-                if response == "q":
-                    print("Stopping processing.")
-                    break
-                elif response == "s":
-                    print("Skipping this batch.")
-                    continue
-                elif response != "y":
-                    print("Skipping this batch.")
-                    continue
+    @staticmethod
+    def _is_complete_response(raw_response: str) -> bool:
+        """Whether Claude's reply is a whole JSON object, i.e. it wasn't cut
+        off before listing every card that needs changes"""
+        try:
+            _json_loads(raw_response.strip())
+            return True
+        except ValueError:
+            return False
 
-                # Apply changes
-                changes_applied = 0
-                for card in processed_cards:
-                    try:
-                        print(f"\nApplying changes to note ID {card}...")
+    def process_deck(
+        self,
+        card_ids: List[int],
+        batch_size: int,
+        max_concurrent_batches: int = 4,
+        backup: Optional[Future] = None,
+    ):
+        """Process the entire deck in batches
+
+        If backup is given, it is a backup still being written; nothing is
+        applied to Anki until it has finished.
+        """
+
+        batches = [
+            card_ids[i : i + batch_size] for i in range(0, len(card_ids), batch_size)
+        ]
+        total_batches = len(batches)
+
+        # Claude calls take seconds each, so keep the next few batches in flight
+        # while the current one is being reviewed. Prompts stay sequential.
+        pool = ThreadPoolExecutor(max_workers=max_concurrent_batches)
+        futures = {}
+        # Each note is handled by the first batch to reach it, see _prepare_batch
+        claimed_note_ids = set()
+
+        def submit(index: int):
+            if index < total_batches:
+                futures[index] = pool.submit(
+                    self._prepare_batch, batches[index], claimed_note_ids
+                )
 
-                        note_id = card["note_id"]
-                        updated_fields = card.get("updated_fields", {})
+        for index in range(max_concurrent_batches):
+            submit(index)
 
-                        if updated_fields:
-                            for field_name, new_value in updated_fields.items():
-                                new_value = new_value.replace("\n", "<br>")
-                                updated_fields[field_name] = new_value
+        # Process in batches
+        processed_count = 0
+        try:
+            for index, batch_card_ids in enumerate(batches):
+                batch_num = index + 1
+                future = futures.pop(index)
+                submit(index + max_concurrent_batches)
 
-                            prev_tags = self.anki.get_note_tags(note_id)
-                            tags = prev_tags + ["reviewed"]
-                            self.anki.update_note(note_id, updated_fields, tags)
-                            changes_applied += 1
+                log.info(
+                    f"\n--- Processing batch {batch_num}/{total_batches} ({len(batch_card_ids)} cards) ---"
+                )
 
-                    except Exception as e:
-                        print(f"✗ Failed to update note {card['note_id']}: {e}")
+                try:
+                    enriched_cards, processed_cards, batch_output = future.result()
+                    if batch_output:
+                        log.info(batch_output.rstrip())
 
-                print(f"✓ Applied {changes_applied} changes in batch {batch_num}")
-                processed_count += changes_applied
+                    if not processed_cards:
+                        log.info("No changes suggested by Claude for this batch")
+                        continue
 
-            except Exception as e:
-                print(f"✗ Error processing batch {batch_num}: {e}")
-                continue
+                    # Review changes before applying
+                    log.info(f"\nClaude suggests {len(processed_cards)} changes:")
+                    cards_by_note_id = {
+                        c["note"].get("noteId"): c for c in enriched_cards
+                    }
+                    # Extract the original field values once; they are used for
+                    # the diffs here and for the content hashes after applying
+                    original_values = {
+                        note_id: self._field_values(c["note"])
+                        for note_id, c in cards_by_note_id.items()
+                    }
+                    # Build each card's diff and its update payload in one pass;
+                    # the payloads are applied below if the user accepts
+                    pending = []
+                    for card in processed_cards:
+                        # Get the original card info to show the front field
+                        original_fields = original_values.get(card["note_id"])
+                        updated_fields = card.get("updated_fields", {})
+                        if not updated_fields:
+                            continue
+                        diff_text, update_fields = self._build_update(
+                            original_fields, updated_fields
+                        )
+                        if original_fields is not None and diff_text:
+                            # Log each card's output as one record; many small
+                            # prints are slow on some consoles
+                            front_field = original_fields.get("Front", "Unknown")
+                            log.info(f"\n--- Card: {front_field} ---\n{diff_text.rstrip()}")
+                        # Unchanged cards are still updated so they get the reviewed tag
+                        pending.append((card["note_id"], update_fields))
+                    # Make sure everything above is on screen before prompting
+                    _flush_log()
+
+                    # Ask for confirmation
+                    response = input(
+                        f"\nApply these changes to batch {batch_num}? (y/n/s=skip/q=quit): "
+                    ).lower()
+
+                    if response == "q":
+                        log.info("Stopping processing.")
+                        break
+                    elif response == "s":
+                        log.info("Skipping this batch.")
+                        continue
+                    elif response != "y":
+                        log.info("Skipping this batch.")
+                        continue
 
-            # Small delay to be respectful to APIs
-            time.sleep(1)
+                    if backup is not None:
+                        try:
+                            backup.result()
+                        except Exception:
+                            log.error("✗ Backup failed, stopping before any changes are applied")
+                            break
+
+                    changes_applied = 0
+                    if pending:
+                        applied_note_ids = self._apply_updates(pending)
+                        changes_applied = len(applied_note_ids)
+
+                        # Remember what each card looks like now so the next run
+                        # doesn't send it to Claude again unless it changes. Notes
+                        # whose update failed are left out so they are retried.
+                        fields_by_note_id = dict(pending)
+                        new_hashes = {}
+                        for note_id in applied_note_ids:
+                            original_card = cards_by_note_id.get(note_id)
+                            if not original_card:
+                                continue
+                            note = original_card["note"]
+                            field_values = dict(original_values[note_id])
+                            field_values.update(fields_by_note_id[note_id])
+                            new_hashes[str(original_card["cardId"])] = self._content_hash(
+                                field_values, note.get("modelName")
+                            )
+                        # Updating changed the notes' modification times
+                        for note_id, mod in self._get_note_mods(applied_note_ids).items():
+                            new_hashes[self._note_mod_key(note_id)] = mod
+                        if new_hashes:
+                            self._append_processed_hashes(new_hashes)
 
-        print("=== Processing Complete ===")
-        print(f"Total cards processed: {processed_count}")
+                    log.info(f"✓ Applied {changes_applied} changes in batch {batch_num}")
+                    processed_count += changes_applied
+
+                except Exception as e:
+                    log.error(f"✗ Error processing batch {batch_num}: {e}")
+                    continue
+        finally:
+            # Don't spend Claude calls on batches the user will never see
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        log.info("=== Processing Complete ===")
+        log.info(f"Total cards processed: {processed_count}")
 
     def process_cards_for_review(
         self,
@@ -1965,7 +2819,7 @@ class AnkiDeckFixer:
         # Verify deck exists
         deck_names = self.anki.get_deck_names()
 
-        if deck_name not in deck_names:
+        if deck_name not in set(deck_names):
             raise Exception(
                 f"Deck '{deck_name}' not found. Available decks: {', '.join(deck_names)}"
             )
@@ -1983,9 +2837,9 @@ class AnkiDeckFixer:
             seen = set()
             updated_word_count = 0
             new_word_count = 0
-            for word in words:
-                search = f"\"front:re:^.*\\b{word}\\b.*$\""
-                results = self.anki.get_cards_in_deck_with_search(deck_name, search)
+            searches = [f"\"front:re:^.*\\b{word}\\b.*$\"" for word in words]
+            all_results = self.anki.find_cards_in_deck_for_searches(deck_name, searches)
+            for word, results in zip(words, all_results):
                 if results:
                     # If found more than 1, skip
                     if len(results) > 1:
@@ -2034,7 +2888,7 @@ class AnkiDeckFixer:
                 search = "-tag:reviewed is:new" # By default only process new, unreviewed cards
             card_ids = self.anki.get_cards_in_deck_with_search(deck_name, search)
 
-            if len(card_ids) == 0:
+            if not card_ids:
                 print("Found 0 cards to review")
                 return {
                     "deck_name": deck_name,
@@ -2096,18 +2950,17 @@ class AnkiDeckFixer:
                     print(f"Card doesn't contain note property, skipping: {card} ({i})")
             note_ids = list(note_ids)
             notes_info = self.anki.get_note_info(note_ids)
+            notes_by_id = {n.get("noteId"): n for n in notes_info}
             
             # Combine card and note info
             for card in cards_info:
                 if card.get("note") is not None:
-                    note_id = card["note"]
-                    note_info = next((n for n in notes_info if n["noteId"] == note_id), {})
-                    card["note"] = note_info
+                    card["note"] = notes_by_id.get(card["note"], {})
                     enriched_cards.append(card)
 
         # Process with Claude
         print("Processing with Claude API...")
-        processed_cards, full_log = self.processor.process_card_batch(enriched_cards)
+        processed_cards, full_log = self.processor.process_cards_concurrently(enriched_cards)
         print(f"Claude processing complete, got {len(processed_cards)} processed cards")
 
         # Re-attach is_new_card flag for placeholder cards that Claude processed
@@ -2117,11 +2970,9 @@ class AnkiDeckFixer:
                 processed_card["is_new_card"] = True
 
         # Add original fields for comparison
+        cards_by_note_id = {c["note"].get("noteId"): c for c in enriched_cards}
         for processed_card in processed_cards:
-            note_id = processed_card["note_id"]
-            original_card = next(
-                (c for c in enriched_cards if c["note"]["noteId"] == note_id), None
-            )
+            original_card = cards_by_note_id.get(processed_card["note_id"])
             if original_card:
                 processed_card["original_fields"] = original_card["note"]["fields"]
 
@@ -2157,6 +3008,24 @@ class AnkiDeckFixer:
         deck_name = changes_data.get("deck_name")
         results = {"applied_count": 0, "failed_count": 0, "errors": []}
 
+        # Fetch the tags of every existing note in one round trip up front
+        existing_note_ids = [
+            card["note_id"] for card in selected_cards if not card.get("is_new_card", False)
+        ]
+        tags_by_note_id = {}
+        if existing_note_ids:
+            try:
+                all_tags = self.anki.multi(
+                    [
+                        {"action": "getNoteTags", "params": {"note": note_id}}
+                        for note_id in existing_note_ids
+                    ]
+                )
+                tags_by_note_id = dict(zip(existing_note_ids, all_tags))
+            except Exception as e:
+                print(f"Batch tag lookup failed, fetching tags per note: {e}")
+
+        updates = []
         for card in selected_cards:
             try:
                 note_id = card["note_id"]
@@ -2166,9 +3035,7 @@ class AnkiDeckFixer:
                 if card.get("is_new_card", False) and isinstance(note_id, str) and note_id.startswith("new_"):
                     # Create new card
                     if updated_fields:
-                        for field_name, new_value in updated_fields.items():
-                            new_value = new_value.replace("\n", "<br>")
-                            updated_fields[field_name] = new_value
+                        self._newlines_to_br(updated_fields)
 
                         # Create the new note in Anki
                         new_note_id = self.anki.add_note(
@@ -2186,15 +3053,18 @@ class AnkiDeckFixer:
                 else:
                     # Update existing card - always update to add reviewed tag
                     if updated_fields:
-                        for field_name, new_value in updated_fields.items():
-                            new_value = new_value.replace("\n", "<br>")
-                            updated_fields[field_name] = new_value
+                        self._newlines_to_br(updated_fields)
 
                         # TODO: Add forvo audio & change note type when needed
 
-                    tags = self.anki.get_note_tags(note_id) + ["reviewed"]
-                    self.anki.update_note(note_id, updated_fields, tags)
-                    results["applied_count"] += 1
+                    tags = tags_by_note_id.get(note_id)
+                    error = AnkiConnector.multi_error(tags)
+                    if error:
+                        raise Exception(error)
+                    if tags is None:
+                        tags = self.anki.get_note_tags(note_id)
+                    tags = tags + ["reviewed"]
+                    updates.append((note_id, updated_fields, tags))
 
             except Exception as e:
                 results["failed_count"] += 1
@@ -2202,23 +3072,44 @@ class AnkiDeckFixer:
                     f"Note {card.get('note_id', 'unknown')}: {str(e)}"
                 )
 
+        # Send every existing-note update in a single request, retrying the ones
+        # that failed one request per note so failures can be reported individually
+        if updates:
+            failed = updates
+            try:
+                errors = self.anki.update_notes(updates)
+                failed = [update for update, error in zip(updates, errors) if error]
+                results["applied_count"] += len(updates) - len(failed)
+            except Exception:
+                pass
+            for note_id, fields, tags in failed:
+                try:
+                    self.anki.update_note(note_id, fields, tags)
+                    results["applied_count"] += 1
+                except Exception as e:
+                    results["failed_count"] += 1
+                    results["errors"].append(f"Note {note_id}: {str(e)}")
+
         return results
 
     def _sort_cards_by_priority(self, card_ids: List[int]) -> List[int]:
         if not card_ids:
             return card_ids
 
-        # Get card info including stats
-        cards_info = self.anki.get_card_info(card_ids)
+        # Page through the card info and keep only what the sort needs, so a
+        # large deck's full card info is never resident at once
+        due_and_ids = []
+        for page in self.anki.iter_card_info(card_ids):
+            due_and_ids.extend((int(c.get("due", 0)), c.get("cardId", 0)) for c in page)
 
         # Order new cards by their new-position due (ascending)
-        new_cards_sorted = sorted(cards_info, key=lambda c: int(c.get("due", 0)))
+        due_and_ids.sort(key=lambda pair: pair[0])
 
-        sorted_card_ids = [c.get("cardId", 0) for c in new_cards_sorted]
+        sorted_card_ids = [card_id for _, card_id in due_and_ids]
 
         # Log selection results
         print("Selection complete (new cards only):")
-        print(f"  - Total input cards: {len(cards_info)}")
+        print(f"  - Total input cards: {len(due_and_ids)}")
         print(f"  - Selected new cards (reps=0): {len(sorted_card_ids)}")
 
         return sorted_card_ids
@@ -2229,6 +3120,7 @@ def main():
 
     # Parse command line arguments
     args = parse_arguments()
+    _setup_logging()
 
     if args.word_list and args.flagged_only:
         print(
@@ -2271,6 +3163,8 @@ def main():
     # Handle web interface
     if args.web:
         try:
+            # Load the Anthropic SDK while the browser opens the interface
+            threading.Thread(target=lambda: fixer.processor.client, daemon=True).start()
             server = start_web_server(fixer, args.port)
             print("Press Ctrl+C to stop the server")
 
@@ -2289,11 +3183,12 @@ def main():
     # Get available decks
     try:
         decks = fixer.anki.get_deck_names()
+        known_decks = set(decks)
 
         # Get deck selection
         if args.deck:
             deck_name = args.deck
-            if deck_name not in decks:
+            if deck_name not in known_decks:
                 print(f"✗ Deck '{deck_name}' not found")
                 return
         else:
@@ -2313,7 +3208,7 @@ def main():
                     return
             else:
                 deck_name = deck_choice
-                if deck_name not in decks:
+                if deck_name not in known_decks:
                     print(f"Deck '{deck_name}' not found")
                     return
 
@@ -2341,20 +3236,16 @@ def main():
         print(f"\nStarting to process deck '{deck_name}'")
         print("Press Ctrl+C at any time to stop safely")
 
-        # Verify deck exists
-        deck_names = fixer.anki.get_deck_names()
-        if deck_name not in deck_names:
-            print(
-                f"✗ Deck '{deck_name}' not found. Available decks: {', '.join(deck_names)}"
-            )
-            return
-
-        # Create backup if enabled
-        fixer.create_backup(deck_name)
+        # Create the backup in the background; the first batches are sent to
+        # Claude meanwhile, and process_deck waits for it before writing
+        backup_pool = ThreadPoolExecutor(max_workers=1)
+        backup = backup_pool.submit(fixer.create_backup, deck_name)
+        backup_pool.shutdown(wait=False)
 
         card_ids = []
 
         if args.parse_offline_updates:
+            backup.result()
             for update in offline_updates:
                 fixer.anki.request("updateNote", **update)
             return
@@ -2365,9 +3256,9 @@ def main():
                 word.strip() for word in args.word_list.split(",") if word.strip()
             ]
             print(f"Filtering cards to only include words: {', '.join(existing_words)}")
-            for word in existing_words:
-                search = f"\"front:re:^.*\\b{word}\\b.*$\""
-                results = fixer.anki.get_cards_in_deck_with_search(deck_name, search)
+            searches = [f"\"front:re:^.*\\b{word}\\b.*$\"" for word in existing_words]
+            all_results = fixer.anki.find_cards_in_deck_for_searches(deck_name, searches)
+            for word, results in zip(existing_words, all_results):
                 if results:
                     print(f"Found {len(results)} cards for word '{word}'")
                     card_ids.extend(results)
@@ -2392,7 +3283,7 @@ def main():
             card_ids = card_ids[start_from:]
             print(f"Starting from card {start_from + 1}")
 
-        fixer.process_deck(card_ids, batch_size)
+        fixer.process_deck(card_ids, batch_size, backup=backup)
 
     except KeyboardInterrupt:
         print("\n\nProcessing interrupted by user.")
@@ -0,0 +1,37 @@
+"""
+HTTP response helpers shared by the deck fixer and deck cleaner web servers
+"""
+
+from http.server import BaseHTTPRequestHandler
+from typing import List, Tuple
+
+# Sent with every API response so the page also works when opened from elsewhere
+CORS_HEADERS = [
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type"),
+]
+
+
+def send_response_with_body(
+    handler: BaseHTTPRequestHandler,
+    status_code: int,
+    headers: List[Tuple[str, str]],
+    body: bytes,
+):
+    """Send the status line, headers, Content-Length and body in a single write
+
+    send_response/end_headers followed by a separate body write costs two sends
+    per response; with keep-alive connections the second one would otherwise
+    wait on the first.
+    """
+    handler.log_request(status_code)
+    reason = handler.responses.get(status_code, ("",))[0]
+    lines = [
+        f"{handler.protocol_version} {status_code} {reason}",
+        f"Server: {handler.version_string()}",
+        f"Date: {handler.date_time_string()}",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    lines.append(f"Content-Length: {len(body)}")
+    handler.wfile.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
@@ -8,6 +8,8 @@ import argparse
 # [sound:hypertts-<anything>.mp3] from the Front and Back fields of notes in a deck.
 
 HYPERTTS_SOUND_RE = re.compile(r"\[sound:hypertts-[^\]]*?\.mp3\]")
+MULTI_SPACE_RE = re.compile(r"  +")
+DIV_OR_NBSP_RE = re.compile(r"<div>.*?</div> | &nbsp;")
 
 url: str = "http://localhost:8765"
 
@@ -50,12 +52,12 @@ def remove_hypertts_tags(text: str) -> str:
     if not text:
         return text
     new_text = HYPERTTS_SOUND_RE.sub("", text)
-    new_text = re.sub(r"  +", " ", new_text).strip()
+    new_text = MULTI_SPACE_RE.sub(" ", new_text).strip()
     return new_text
 
 def clean_text(text: str) -> str:
     # Remove <div> tags and &nbsp; and trim
-    return re.sub(r"<div>.*?</div> | &nbsp;", "", text).strip()
+    return DIV_OR_NBSP_RE.sub("", text).strip()
 
 def chunked(iterable: List[int], n: int):
     for i in range(0, len(iterable), n):
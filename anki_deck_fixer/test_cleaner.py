@@ -3,7 +3,17 @@
 Test suite for the AnkiDeckCleaner with exact string comparisons
 """
 
-from anki_deck_cleaner import CardCleaner
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+import anki_deck_cleaner
+from anki_deck_cleaner import AnkiConnector, AnkiDeckCleaner, CardCleaner, WebServer
+
 
 def test_examples():
     cleaner = CardCleaner()
@@ -200,14 +210,219 @@ def test_examples():
         else:
             print("✅ Changed flag correct ({changed})".format(changed=changed))
     
+    assert all_passed, "some checks failed"
+
+def check(description, ok, details=""):
+    """Print a ✅/❌ line for one expectation and return whether it held"""
+    print(f"✅ {description}" if ok else f"❌ {description}{details}")
+    return ok
+
+class FakeAnki:
+    """Stands in for AnkiConnect with one single-note card per back field"""
+
+    url = "http://localhost:0"
+
+    def __init__(self, backs):
+        self.backs = backs
+
+    def find_cards(self, query):
+        return sorted(self.backs)
+
+    def get_card_info(self, card_ids):
+        return [
+            {
+                "cardId": card_id,
+                "noteId": 100 + card_id,
+                "fields": {
+                    "Front": {"value": "Ett hus", "order": 0},
+                    "Back": {"value": self.backs[card_id], "order": 1},
+                },
+            }
+            for card_id in card_ids
+        ]
+
+def scan(backs, use_cleaned_hashes=True):
+    """Scan a fake deck with a fresh cleaner, as a new run would, and return
+    the IDs of the cards that were cleaned and of those that need changes"""
+    cleaner = AnkiDeckCleaner(use_cleaned_hashes=use_cleaned_hashes)
+    cleaner.anki = FakeAnki(backs)
+    cleaned_backs = []
+    clean_card = cleaner.card_cleaner.clean_card
+
+    def counting_clean_card(front, back):
+        cleaned_backs.append(back)
+        return clean_card(front, back)
+
+    cleaner.card_cleaner.clean_card = counting_clean_card
+    result = cleaner.process_cards_for_review("Deck", batch_size=len(backs))
+    cleaned_ids = sorted(card_id for card_id, back in backs.items() if back in cleaned_backs)
+    return cleaned_ids, [card["card_id"] for card in result["cards"]]
+
+def test_cleaned_hashes():
+    print("\nTesting the cleaned-note hash file\n" + "="*60)
+    all_passed = True
+    clean_back = "A house"
+    messy_back = 'A house<br>(t.ex. "Ett stort hus")'
+    backs = {1: clean_back, 2: messy_back}
+
+    saved_path = anki_deck_cleaner.CLEANED_HASHES_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        anki_deck_cleaner.CLEANED_HASHES_PATH = os.path.join(tmp, "hashes.jsonl")
+        try:
+            cleaned, to_review = scan(backs)
+            all_passed &= check("First scan cleans every card", cleaned == [1, 2], f": {cleaned}")
+            all_passed &= check("Only the messy card is offered for review", to_review == [2], f": {to_review}")
+
+            cleaned, to_review = scan(backs)
+            all_passed &= check("Next run skips the note found clean", cleaned == [2], f": {cleaned}")
+            all_passed &= check("...and still offers the messy card", to_review == [2], f": {to_review}")
+
+            cleaned, _ = scan({1: clean_back + " (edited)", 2: messy_back})
+            all_passed &= check("An edited note is cleaned again", cleaned == [1, 2], f": {cleaned}")
+
+            cleaned, _ = scan(backs, use_cleaned_hashes=False)
+            all_passed &= check("--recheck cleans every card", cleaned == [1, 2], f": {cleaned}")
+
+            with open(anki_deck_cleaner.CLEANED_HASHES_PATH, "a", encoding="utf-8") as f:
+                f.write('{"101": "3f')
+            cleaned, _ = scan(backs)
+            all_passed &= check("A torn last line is ignored", cleaned == [2], f": {cleaned}")
+        finally:
+            anki_deck_cleaner.CLEANED_HASHES_PATH = saved_path
+
+    assert all_passed, "some checks failed"
+
+class FakeAnkiConnect(AnkiConnector):
+    """An AnkiConnector answering requests itself, where updating a note in
+    failing_updates fails that many times. Like AnkiConnect, multi reports a
+    failed action in its result instead of failing the request."""
+
+    def __init__(self, failing_updates):
+        super().__init__()
+        self.failing_updates = dict(failing_updates)  # note ID -> failures left
+        self.updated_note_ids = []
+
+    def request(self, action, **params):
+        if action != "multi":
+            return self.update_note(params["note"]["id"])
+        results = []
+        for sub_action in params["actions"]:
+            try:
+                results.append(self.update_note(sub_action["params"]["note"]["id"]))
+            except Exception as e:
+                results.append({"result": None, "error": str(e)})
+        return results
+
+    def update_note(self, note_id):
+        if self.failing_updates.get(note_id):
+            self.failing_updates[note_id] -= 1
+            raise Exception("collection is locked")
+        self.updated_note_ids.append(note_id)
+        return None
+
+def test_apply_selected_changes():
+    print("\nTesting applying the selected changes\n" + "="*60)
+    all_passed = True
+    cleaner = AnkiDeckCleaner(use_cleaned_hashes=False)
+    cleaner.anki = FakeAnkiConnect(failing_updates={102: 2, 103: 1})
+    recorded = {}
+    cleaner._append_cleaned_hashes = recorded.update
+    updates = [
+        {"card_id": card_id, "note_id": 100 + card_id, "front_field": "Front", "back_field": "Back",
+         "front": "Ett hus", "back": "A house"}
+        for card_id in (1, 2, 3)
+    ]
+
+    result = cleaner.apply_selected_changes({"updates": updates})
+    all_passed &= check(
+        "Only notes whose update succeeded are counted",
+        result["updated_count"] == 2 and sorted(cleaner.anki.updated_note_ids) == [101, 103],
+        f": {result}",
+    )
+    all_passed &= check(
+        "Only those notes are recorded as cleaned",
+        sorted(recorded) == ["101", "103"],
+        f": {sorted(recorded)}",
+    )
+    assert all_passed, "some checks failed"
+
+def post_process_stream(port, accept_gzip):
+    """POST a streamed /api/process request and return the response and its NDJSON records"""
+    connection = http.client.HTTPConnection("localhost", port, timeout=10)
+    headers = {"Content-Type": "application/json"}
+    if accept_gzip:
+        headers["Accept-Encoding"] = "gzip"
+    body = json.dumps({"deck_name": "Deck", "batch_size": 10, "stream": True})
+    connection.request("POST", "/api/process", body=body, headers=headers)
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    if response.getheader("Content-Encoding") == "gzip":
+        data = gzip.decompress(data)
+    return response, [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+def test_process_stream():
+    print("\nTesting the streamed /api/process response\n" + "="*60)
+    all_passed = True
+
+    cleaner = AnkiDeckCleaner(use_cleaned_hashes=False)
+    cleaner.anki = FakeAnki({1: "A house", 2: 'A house<br>(t.ex. "Ett stort hus")', 3: 'Hus (t.ex. "Huset")'})
+    cleaner._append_cleaned_hashes = lambda new_hashes: None
+    saved_cleaner = WebServer.cleaner
+    saved_log_message = WebServer.log_message
+    WebServer.cleaner = cleaner
+    WebServer.log_message = lambda self, format, *args: None
+    server = ThreadingHTTPServer(("localhost", 0), WebServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for accept_gzip in (False, True):
+            label = "gzip" if accept_gzip else "plain"
+            response, records = post_process_stream(server.server_address[1], accept_gzip)
+            all_passed &= check(
+                f"{label}: response is chunked NDJSON",
+                response.status == 200
+                and response.getheader("Transfer-Encoding") == "chunked"
+                and response.getheader("Content-Type", "").startswith("application/x-ndjson"),
+            )
+            all_passed &= check(
+                f"{label}: one line per card needing changes, then the summary",
+                [list(record) for record in records] == [["card"], ["card"], ["summary"]],
+                f": {records}",
+            )
+            all_passed &= check(
+                f"{label}: cards arrive in deck order",
+                [record["card"]["card_id"] for record in records[:-1]] == [2, 3],
+            )
+            all_passed &= check(
+                f"{label}: summary counts the whole deck",
+                records[-1]["summary"].get("total_cards") == 3,
+                f": {records[-1]}",
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+        WebServer.cleaner = saved_cleaner
+        WebServer.log_message = saved_log_message
+
+    assert all_passed, "some checks failed"
+
+def passes(test):
+    """Run a test and report whether every check in it held, so a script run
+    goes on to the remaining tests where pytest would stop at the assert"""
+    try:
+        test()
+        return True
+    except AssertionError:
+        return False
+
+if __name__ == '__main__':
+    results = [
+        passes(test)
+        for test in (test_examples, test_cleaned_hashes, test_apply_selected_changes, test_process_stream)
+    ]
     print("\n" + "="*60)
-    if all_passed:
+    if all(results):
         print("🎉 All tests passed!")
     else:
         print("❌ Some tests failed!")
-    
-    return all_passed
-
-if __name__ == '__main__':
-    success = test_examples()
-    exit(0 if success else 1)
+    exit(0 if all(results) else 1)
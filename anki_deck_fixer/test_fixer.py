@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Test suite for the AnkiDeckFixer helpers that don't call Claude
+"""
+
+import builtins
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anki_deck_fixer
+from anki_deck_fixer import (
+    AnkiConnector,
+    AnkiDeckFixer,
+    DiffFormatter,
+    ForvoAPI,
+    ProcessedCardStream,
+    RateLimiter,
+    RESPONSE_PREFILL,
+)
+
+def check(description, ok, details=""):
+    """Print a ✅/❌ line for one expectation and return whether it held"""
+    print(f"✅ {description}" if ok else f"❌ {description}{details}")
+    return ok
+
+CARDS = [
+    {"note_id": 1, "updated_fields": {"Back": 'A "quoted" } brace'}},
+    {"note_id": 2, "updated_fields": {"Back": "Closing ] bracket, and a \\\\ backslash"}},
+    {"note_id": 3, "updated_fields": {"Front": "Ett hus", "Back": "A house<br>{not json}"}},
+]
+
+def test_processed_card_stream():
+    print("\nTesting ProcessedCardStream\n" + "="*60)
+    all_passed = True
+    response = json.dumps({"processed_cards": CARDS}, indent=2)
+    # Claude's reply continues the prefilled opening of the object
+    reply = response.replace('{\n  "processed_cards": [', RESPONSE_PREFILL, 1)
+
+    for chunk_size in (1, 3, 7, len(reply)):
+        stream = ProcessedCardStream()
+        completed = []
+        for i in range(0, len(reply), chunk_size):
+            completed.append(len(stream.feed(reply[i:i + chunk_size])))
+        all_passed &= check(
+            f"{chunk_size}-character chunks yield every card once",
+            stream.cards == CARDS and sum(completed) == len(CARDS),
+            f": {stream.cards}",
+        )
+
+    stream = ProcessedCardStream()
+    cut = reply.index('"note_id": 3')
+    stream.feed(reply[:cut])
+    all_passed &= check("A cut-off reply keeps the cards it finished", stream.cards == CARDS[:2])
+
+    stream = ProcessedCardStream()
+    stream.feed(reply + '\n{"note_id": 4}')
+    all_passed &= check("Text after the array is ignored", stream.cards == CARDS)
+
+    stream = ProcessedCardStream()
+    stream.feed("Sure, here you go: ")
+    all_passed &= check("Nothing is yielded before the array starts", stream.cards == [])
+
+    assert all_passed, "some checks failed"
+
+def test_is_complete_response():
+    print("\nTesting _is_complete_response\n" + "="*60)
+    all_passed = True
+    complete = RESPONSE_PREFILL + json.dumps(CARDS)[1:] + "}"
+    all_passed &= check("A whole reply is complete", AnkiDeckFixer._is_complete_response(complete))
+    all_passed &= check(
+        "An empty card list is complete",
+        AnkiDeckFixer._is_complete_response(RESPONSE_PREFILL + "]}\n"),
+    )
+    all_passed &= check(
+        "A reply cut off by max_tokens is not",
+        not AnkiDeckFixer._is_complete_response(complete[:-20]),
+    )
+    all_passed &= check("A failed call is not", not AnkiDeckFixer._is_complete_response(""))
+    assert all_passed, "some checks failed"
+
+class FakeAnki:
+    """Stands in for an AnkiConnect too old for notesModTime, with one card
+    per note, recording which notes had their fields fetched"""
+
+    def __init__(self, notes):
+        self.notes = notes  # note ID -> (mod, back)
+        self.fetched_note_ids = []
+
+    def get_card_info(self, card_ids):
+        return [{"cardId": card_id, "note": 100 + card_id % 10} for card_id in card_ids]
+
+    def get_note_info(self, note_ids):
+        self.fetched_note_ids.extend(note_ids)
+        return [
+            {
+                "noteId": note_id,
+                "modelName": "Basic",
+                "fields": {
+                    "Front": {"value": "Ett hus"},
+                    "Back": {"value": self.notes[note_id][1]},
+                },
+            }
+            for note_id in note_ids
+        ]
+
+class FakeProcessor:
+    """Stands in for Claude, suggesting nothing and recording what it was sent"""
+
+    def __init__(self, reply=RESPONSE_PREFILL + "]}", processed_cards=()):
+        self.reply = reply
+        self.processed_cards = list(processed_cards)
+        self.sent_card_ids = []
+
+    def process_card_batch(self, cards, additional_info="", out=None):
+        self.sent_card_ids.extend(card["cardId"] for card in cards)
+        return self.processed_cards, self.reply
+
+def prepare(anki, card_ids, reply=RESPONSE_PREFILL + "]}", claimed_note_ids=None):
+    """Prepare one batch with a fresh fixer, as a new run would, and return
+    the note IDs whose fields were fetched and the card IDs sent to Claude"""
+    fixer = AnkiDeckFixer("test-key", should_create_backup=False)
+    fixer.anki = anki
+    fixer.processor = FakeProcessor(reply)
+    fixer._prepare_batch(card_ids, claimed_note_ids)
+    return sorted(anki.fetched_note_ids), sorted(fixer.processor.sent_card_ids)
+
+class processed_hashes_file:
+    """Point the fixer at an empty processed-card hash file for the duration"""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved_path = anki_deck_fixer.PROCESSED_HASHES_PATH
+        anki_deck_fixer.PROCESSED_HASHES_PATH = os.path.join(self.tmp.name, "hashes.jsonl")
+        return anki_deck_fixer.PROCESSED_HASHES_PATH
+
+    def __exit__(self, *exc_info):
+        anki_deck_fixer.PROCESSED_HASHES_PATH = self.saved_path
+        self.tmp.cleanup()
+
+def test_left_out_cards():
+    print("\nTesting cards Claude leaves out as clean\n" + "="*60)
+    all_passed = True
+    notes = {101: (5, "A house"), 102: (5, "A car")}
+
+    with processed_hashes_file():
+        _, sent = prepare(FakeAnki(notes), [1, 2], reply=RESPONSE_PREFILL + "]")
+        all_passed &= check("First run sends every card", sent == [1, 2], f": {sent}")
+        _, sent = prepare(FakeAnki(notes), [1, 2])
+        all_passed &= check("A cut-off reply records nothing as clean", sent == [1, 2], f": {sent}")
+        _, sent = prepare(FakeAnki(notes), [1, 2])
+        all_passed &= check("Cards left out of a complete reply are skipped next run", sent == [], f": {sent}")
+
+    assert all_passed, "some checks failed"
+
+def test_processed_hashes():
+    print("\nTesting the processed-card hash file\n" + "="*60)
+    all_passed = True
+    notes = {101: (5, "A house"), 102: (5, "A car")}
+    edited_notes = {101: (6, "A big house"), 102: (5, "A car")}
+
+    with processed_hashes_file() as path:
+        prepare(FakeAnki(notes), [1, 2])
+        _, sent = prepare(FakeAnki(edited_notes), [1, 2])
+        all_passed &= check("Only the edited note is sent again", sent == [1], f": {sent}")
+
+        # The edited note came back clean too, so now the whole batch is skipped
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"2": "3f')
+        _, sent = prepare(FakeAnki(edited_notes), [1, 2])
+        all_passed &= check("A torn last line is ignored", sent == [], f": {sent}")
+
+    assert all_passed, "some checks failed"
+
+class FakeAnkiWithModTimes(FakeAnki):
+    """A FakeAnki that also answers notesModTime"""
+
+    def get_notes_mod_time(self, note_ids):
+        return [{"noteId": note_id, "mod": self.notes[note_id][0]} for note_id in note_ids]
+
+def test_note_mod_times():
+    print("\nTesting the notesModTime skip\n" + "="*60)
+    all_passed = True
+
+    with processed_hashes_file():
+        prepare(FakeAnkiWithModTimes({101: (5, "A house"), 102: (5, "A car")}), [1, 2])
+        fetched, sent = prepare(FakeAnkiWithModTimes({101: (5, "A house"), 102: (5, "A car")}), [1, 2])
+        all_passed &= check(
+            "Notes not modified since are skipped without fetching them",
+            fetched == [] and sent == [],
+            f": fetched {fetched}, sent {sent}",
+        )
+
+        fetched, sent = prepare(FakeAnkiWithModTimes({101: (6, "A house"), 102: (5, "A car")}), [1, 2])
+        all_passed &= check(
+            "A note touched without changing its fields is fetched but not sent",
+            fetched == [101] and sent == [],
+            f": fetched {fetched}, sent {sent}",
+        )
+
+        fetched, sent = prepare(FakeAnkiWithModTimes({101: (7, "A big house"), 102: (5, "A car")}), [1, 2])
+        all_passed &= check(
+            "An edited note is sent again",
+            fetched == [101] and sent == [1],
+            f": fetched {fetched}, sent {sent}",
+        )
+
+    assert all_passed, "some checks failed"
+
+def test_note_claims():
+    print("\nTesting note claims across prefetched batches\n" + "="*60)
+    notes = {103: (1, "A tree"), 104: (1, "A dog")}
+    claimed = set()
+
+    with processed_hashes_file():
+        _, first = prepare(FakeAnki(notes), [3, 4], reply=RESPONSE_PREFILL + "]", claimed_note_ids=claimed)
+        _, second = prepare(FakeAnki(notes), [13, 4], reply=RESPONSE_PREFILL + "]", claimed_note_ids=claimed)
+    assert check(
+        "A note already claimed by another batch is left to it",
+        first == [3, 4] and second == [] and claimed == {103, 104},
+        f": {first}, {second}, {claimed}",
+    )
+
+class FakeAnkiConnect(AnkiConnector):
+    """An AnkiConnector answering requests itself, where getNoteTags fails
+    for notes in failing_tags and updateNote for notes in failing_updates.
+    Like AnkiConnect, multi reports a failed action in its result instead
+    of failing the request."""
+
+    def __init__(self, failing_tags=(), failing_updates=()):
+        super().__init__()
+        self.failing_tags = set(failing_tags)
+        self.failing_updates = dict(failing_updates)  # note ID -> failures left
+        self.updated_note_ids = []
+        self.single_update_note_ids = []
+
+    def request(self, action, **params):
+        if action == "multi":
+            results = []
+            for sub_action in params["actions"]:
+                try:
+                    results.append(self.handle(sub_action["action"], **sub_action["params"]))
+                except Exception as e:
+                    results.append({"result": None, "error": str(e)})
+            return results
+        if action == "updateNote":
+            self.single_update_note_ids.append(params["note"]["id"])
+        return self.handle(action, **params)
+
+    def handle(self, action, note):
+        if action == "getNoteTags":
+            if note in self.failing_tags:
+                raise Exception("note was not found")
+            return ["vocab"]
+        note_id = note["id"]
+        if self.failing_updates.get(note_id):
+            self.failing_updates[note_id] -= 1
+            raise Exception("collection is locked")
+        assert note["tags"] == ["vocab", "reviewed"]
+        self.updated_note_ids.append(note_id)
+        return None
+
+def test_apply_updates():
+    print("\nTesting applying updates through multi\n" + "="*60)
+    all_passed = True
+    fixer = AnkiDeckFixer("test-key", should_create_backup=False)
+    fixer.anki = FakeAnkiConnect(failing_tags=[2], failing_updates={3: 2, 4: 1})
+    pending = [(note_id, {"Back": "Ett hus"}) for note_id in (1, 2, 3, 4)]
+
+    applied = fixer._apply_updates(pending)
+    all_passed &= check(
+        "Only notes whose update succeeded are reported as applied",
+        sorted(applied) == [1, 4] and sorted(fixer.anki.updated_note_ids) == [1, 4],
+        f": {applied}",
+    )
+    all_passed &= check(
+        "Only notes whose update failed are retried on their own",
+        fixer.anki.single_update_note_ids == [3, 4],
+        f": {fixer.anki.single_update_note_ids}",
+    )
+    all_passed &= check("A note whose tags can't be read is left alone", 2 not in applied)
+    assert all_passed, "some checks failed"
+
+def test_apply_selected_changes():
+    print("\nTesting applying changes from the web interface\n" + "="*60)
+    fixer = AnkiDeckFixer("test-key", should_create_backup=False)
+    fixer.anki = FakeAnkiConnect(failing_tags=[2], failing_updates={3: 2, 4: 1})
+    results = fixer.apply_selected_changes(
+        {
+            "deck_name": "Deck",
+            "cards": [{"note_id": note_id, "updated_fields": {"Back": "Ett hus"}} for note_id in (1, 2, 3, 4)],
+        }
+    )
+    assert check(
+        "Each failed note is reported and only the rest are counted as applied",
+        results["applied_count"] == 2
+        and results["failed_count"] == 2
+        and [error.split(":")[0] for error in results["errors"]] == ["Note 2", "Note 3"],
+        f": {results}",
+    )
+
+class FakeAnkiDeck(FakeAnkiConnect):
+    """A FakeAnkiConnect holding one card per note, where updating a note
+    moves its modification time on"""
+
+    def __init__(self, notes, failing_updates=()):
+        super().__init__(failing_updates=failing_updates)
+        self.notes = notes  # note ID -> (mod, back)
+        self.fetched_note_ids = []
+
+    get_card_info = FakeAnki.get_card_info
+    get_note_info = FakeAnki.get_note_info
+    get_notes_mod_time = FakeAnkiWithModTimes.get_notes_mod_time
+
+    def handle(self, action, note):
+        result = super().handle(action, note)
+        if action == "updateNote":
+            mod, _ = self.notes[note["id"]]
+            self.notes[note["id"]] = (mod + 1, note["fields"]["Back"])
+        return result
+
+def test_failed_updates_not_recorded():
+    print("\nTesting that failed updates are retried next run\n" + "="*60)
+    all_passed = True
+    deck = FakeAnkiDeck({101: (5, "Ett hus"), 102: (5, "En bil")}, failing_updates={102: 2})
+    processed_cards = [
+        {"note_id": 101, "updated_fields": {"Back": "A house"}},
+        {"note_id": 102, "updated_fields": {"Back": "A car"}},
+    ]
+
+    with processed_hashes_file():
+        fixer = AnkiDeckFixer("test-key", should_create_backup=False)
+        fixer.anki = deck
+        fixer.processor = FakeProcessor(RESPONSE_PREFILL + json.dumps(processed_cards)[1:] + "}", processed_cards)
+        saved_input = builtins.input
+        builtins.input = lambda prompt="": "y"
+        try:
+            fixer.process_deck([1, 2], batch_size=2)
+        finally:
+            builtins.input = saved_input
+        all_passed &= check("Only the note whose update succeeded changed", deck.updated_note_ids == [101])
+
+        deck.failing_updates.clear()
+        deck.fetched_note_ids.clear()
+        fetched, sent = prepare(deck, [1, 2])
+        all_passed &= check(
+            "The next run fetches and sends the note whose update failed",
+            fetched == [102] and sent == [2],
+            f": fetched {fetched}, sent {sent}",
+        )
+    assert all_passed, "some checks failed"
+
+def test_session_per_thread():
+    print("\nTesting AnkiConnector sessions across threads\n" + "="*60)
+    anki = AnkiConnector()
+    # Hold every worker until all four are running, so each task has its own thread
+    barrier = threading.Barrier(4)
+
+    def sessions_used(_):
+        first = anki.session
+        barrier.wait()
+        return first, anki.session
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        sessions = list(pool.map(sessions_used, range(4)))
+    assert check(
+        "Each thread reuses its own session",
+        all(first is second for first, second in sessions)
+        and len({id(first) for first, _ in sessions} | {id(anki.session)}) == 5,
+    )
+
+def test_rate_limiter():
+    print("\nTesting RateLimiter\n" + "="*60)
+    period = 0.2
+    limiter = RateLimiter(3, period)
+    times = []
+    lock = threading.Lock()
+
+    def call(_):
+        with limiter:
+            with lock:
+                times.append(time.monotonic())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(call, range(7)))
+    times.sort()
+    # Any 4 consecutive calls must span at least one full period
+    spans = [times[i + 3] - times[i] for i in range(len(times) - 3)]
+    assert check(
+        "No more than 3 calls start within any 0.2s window",
+        len(times) == 7 and min(spans) >= period - 0.01,
+        f": {spans}",
+    )
+
+def test_forvo_cache():
+    print("\nTesting the Forvo hit/miss cache\n" + "="*60)
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "forvo.json")
+        # Caches written before lookups were appended are one indented object
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"hits": {"sv:hus": "hus.mp3"}, "misses": ["sv:xyz"]}, f, indent=2)
+        forvo = ForvoAPI(cache_path=path)
+        all_passed &= check(
+            "An old single-object cache loads",
+            forvo._hit_cache == {"sv:hus": "hus.mp3"} and forvo._neg_cache == {"sv:xyz"},
+        )
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            list(pool.map(
+                lambda i: forvo.record_hit(f"ord{i}", f"ord{i}.mp3") if i % 2 else forvo.record_miss(f"ord{i}"),
+                range(40),
+            ))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"hits": {"sv:to')
+        reloaded = ForvoAPI(cache_path=path)
+        all_passed &= check(
+            "Concurrent lookups are all recorded",
+            len(reloaded._hit_cache) == 21 and len(reloaded._neg_cache) == 21,
+            f": {len(reloaded._hit_cache)} hits, {len(reloaded._neg_cache)} misses",
+        )
+
+        reloaded.record_hit("katt", "katt.mp3")
+        all_passed &= check(
+            "A lookup recorded after a torn line survives the next load",
+            ForvoAPI(cache_path=path)._hit_cache.get("sv:katt") == "katt.mp3",
+        )
+        all_passed &= check(
+            "A recorded miss is answered without calling Forvo",
+            ForvoAPI(api_key="unused", cache_path=path).search_pronunciations("ord0") == [],
+        )
+    assert all_passed, "some checks failed"
+
+def test_token_diff():
+    print("\nTesting DiffFormatter token diffs\n" + "="*60)
+    all_passed = True
+    removed = re.compile(r"\033\[91m(.*?)\033\[0m", re.S)
+    added = re.compile(r"\033\[92m(.*?)\033\[0m", re.S)
+    pairs = [
+        ("Ett stort hus", "Ett litet hus"),
+        ("A house<br>(syn: bo)", "A house<br><span>(syn: bo)</span>"),
+        ("  leading  and trailing  ", "leading and trailing"),
+        ("", "Nytt ord"),
+    ]
+    for old, new in pairs:
+        diff = DiffFormatter._format_token_diff(old, new)
+        old_side = added.sub("", removed.sub(r"\1", diff))
+        new_side = removed.sub("", added.sub(r"\1", diff))
+        all_passed &= check(
+            f"Diff of {old!r} -> {new!r} reproduces both sides",
+            old_side == old and new_side == new,
+            f": {diff!r}",
+        )
+    assert all_passed, "some checks failed"
+
+def passes(test):
+    """Run a test and report whether every check in it held, so a script run
+    goes on to the remaining tests where pytest would stop at the assert"""
+    try:
+        test()
+        return True
+    except AssertionError:
+        return False
+
+if __name__ == '__main__':
+    results = [
+        passes(test)
+        for test in (
+            test_processed_card_stream,
+            test_is_complete_response,
+            test_left_out_cards,
+            test_processed_hashes,
+            test_note_mod_times,
+            test_note_claims,
+            test_apply_updates,
+            test_apply_selected_changes,
+            test_failed_updates_not_recorded,
+            test_session_per_thread,
+            test_rate_limiter,
+            test_forvo_cache,
+            test_token_diff,
+        )
+    ]
+    print("\n" + "="*60)
+    if all(results):
+        print("🎉 All tests passed!")
+    else:
+        print("❌ Some tests failed!")
+    exit(0 if all(results) else 1)